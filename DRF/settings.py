@@ -67,6 +67,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'SIAPE.middleware.RolUsuarioMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -102,6 +103,13 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT'),
+        # Conexiones persistentes: se reutiliza la conexión entre requests
+        # en vez de abrir una nueva en cada una (0 = cerrar al terminar el request)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        # Sin transacción por request: las vistas abren transacciones explícitas
+        # (transaction.atomic) solo alrededor de las escrituras que deben ir juntas
+        'ATOMIC_REQUESTS': False,
         'OPTIONS': {
             'charset': 'utf8mb4',
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
@@ -111,6 +119,23 @@ DATABASES = {
 
 AUTH_USER_MODEL = 'SIAPE.Usuario'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# En producción con varios workers usar un backend compartido (Redis/Memcached),
+# por ejemplo CACHE_BACKEND='django.core.cache.backends.redis.RedisCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='siape-cache'),
+    }
+}
+
+# Las cachés que se invalidan con señales (rol de cada usuario, perfiles por rol, KPIs
+# de los dashboards) solo se activan con un backend compartido entre procesos: con
+# LocMemCache cada worker tiene su propia copia y la invalidación no llega a los demás.
+CACHE_COMPARTIDA = 'locmem' not in CACHES['default']['BACKEND'].lower()
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -230,8 +255,12 @@ LOGOUT_REDIRECT_URL = '/'  # Redirige al index (página principal)
 SESSION_COOKIE_AGE = 3600
 # SESSION expira al cerrar el navegador
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
-# Usamos la DB para SESSION
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Usamos la DB para SESSION. Con un CACHE_BACKEND compartido (Redis/Memcached) usar
+# SESSION_ENGINE='django.contrib.sessions.backends.cached_db': la sesión se lee desde
+# la caché y se evita la consulta a django_session en cada request (vistas y API).
+# No usarlo con LocMemCache y varios workers: un logout no invalidaría la sesión
+# cacheada en los otros procesos.
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
 
 # ============================================
 # CONFIGURACIONES DE SEGURIDAD OWASP
@@ -281,6 +310,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Listados acotados: todos los ViewSets paginan por cursor (ver SIAPE/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'SIAPE.pagination.CreatedAtCursorPagination',
     # Configuración para manejar CSRF con SessionAuthentication
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
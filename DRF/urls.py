@@ -96,7 +96,7 @@ urlpatterns = [
     path('dashboard/encargado-inclusion/citas/<int:entrevista_id>/cancelar/', views.cancelar_cita_dashboard, name='cancelar_cita_dashboard'),
     path('dashboard/encargado-inclusion/casos/<int:solicitud_id>/actualizar-descripcion/', views.actualizar_descripcion_caso, name='actualizar_descripcion_caso'),
     path('dashboard/encargado-inclusion/casos/<int:solicitud_id>/subir-archivo/', views.subir_archivo_caso, name='subir_archivo_caso'),
-    path('dashboard/encargado-inclusion/casos/<int:solicitud_id>/enviar-coordinador-tecnico-pedagogico/', views.enviar_a_coordinador_tecnico_pedagogico, name='enviar_a_coordinador_tecnico_pedagogico'),
+    path('dashboard/encargado-inclusion/casos/<int:solicitud_id>/enviar-coordinador-tecnico-pedagogico/', views.transicion_solicitud, {'clave': 'enviar_a_coordinador_tecnico_pedagogico'}, name='enviar_a_coordinador_tecnico_pedagogico'),
     path('dashboard/encargado-inclusion/confirmar-cita/<int:entrevista_id>/', 
          views.confirmar_cita_coordinadora, 
          name='encargado_inclusion_confirmar_cita'),
@@ -117,15 +117,15 @@ urlpatterns = [
     path('dashboard/coordinador-tecnico-pedagogico/casos/<int:solicitud_id>/formular-ajuste/', views.formular_ajuste_coordinador_tecnico_pedagogico, name='formular_ajuste_coordinador_tecnico_pedagogico'),
     path('dashboard/coordinador-tecnico-pedagogico/ajustes/<int:ajuste_asignado_id>/editar/', views.editar_ajuste_coordinador_tecnico_pedagogico, name='editar_ajuste_coordinador_tecnico_pedagogico'),
     path('dashboard/coordinador-tecnico-pedagogico/ajustes/<int:ajuste_asignado_id>/eliminar/', views.eliminar_ajuste_coordinador_tecnico_pedagogico, name='eliminar_ajuste_coordinador_tecnico_pedagogico'),
-    path('dashboard/coordinador-tecnico-pedagogico/casos/<int:solicitud_id>/enviar-asesor-pedagogico/', views.enviar_a_asesor_pedagogico, name='enviar_a_asesor_pedagogico'),
-    path('dashboard/coordinador-tecnico-pedagogico/casos/<int:solicitud_id>/devolver-encargado-inclusion/', views.devolver_a_encargado_inclusion, name='devolver_a_encargado_inclusion'),
+    path('dashboard/coordinador-tecnico-pedagogico/casos/<int:solicitud_id>/enviar-asesor-pedagogico/', views.transicion_solicitud, {'clave': 'enviar_a_asesor_pedagogico'}, name='enviar_a_asesor_pedagogico'),
+    path('dashboard/coordinador-tecnico-pedagogico/casos/<int:solicitud_id>/devolver-encargado-inclusion/', views.transicion_solicitud, {'clave': 'devolver_a_encargado_inclusion'}, name='devolver_a_encargado_inclusion'),
     path('dashboard/coordinador-tecnico-pedagogico/categorias/', views.gestion_categorias_ajustes, name='gestion_categorias_ajustes'),
     path('dashboard/coordinador-tecnico-pedagogico/estadisticas/', views.estadisticas_ajustes_coordinador_tecnico, name='estadisticas_ajustes_coordinador_tecnico'),
     
     # URLs de Asesor Pedagógico
     path('dashboard/asesor/', views.dashboard_asesor, name='dashboard_asesor'),
-    path('dashboard/asesor/casos/<int:solicitud_id>/enviar-director/', views.enviar_a_director, name='enviar_a_director'),
-    path('dashboard/asesor/casos/<int:solicitud_id>/devolver-coordinador-tecnico-pedagogico/', views.devolver_a_coordinador_tecnico_pedagogico, name='devolver_a_coordinador_tecnico_pedagogico'),
+    path('dashboard/asesor/casos/<int:solicitud_id>/enviar-director/', views.transicion_solicitud, {'clave': 'enviar_a_director'}, name='enviar_a_director'),
+    path('dashboard/asesor/casos/<int:solicitud_id>/devolver-coordinador-tecnico-pedagogico/', views.transicion_solicitud, {'clave': 'devolver_a_coordinador_tecnico_pedagogico'}, name='devolver_a_coordinador_tecnico_pedagogico'),
     path('dashboard/asesor/estadisticas/', views.estadisticas_asesor_pedagogico, name='estadisticas_asesor_pedagogico'),
     path('dashboard/asesor/estadisticas/reporte-pdf/', views.generar_reporte_pdf_asesor, name='generar_reporte_pdf_asesor'),
     path('dashboard/asesor/estadisticas/reporte-excel/', views.generar_reporte_excel_asesor, name='generar_reporte_excel_asesor'),
@@ -133,9 +133,9 @@ urlpatterns = [
     path('dashboard/asesor/ajustes/<int:ajuste_asignado_id>/eliminar/', views.eliminar_ajuste_asesor, name='eliminar_ajuste_asesor'),
     
     # URLs de Director de Carrera
-    path('dashboard/director/casos/<int:solicitud_id>/aprobar/', views.aprobar_caso, name='aprobar_caso'),
-    path('dashboard/director/casos/<int:solicitud_id>/rechazar/', views.rechazar_caso, name='rechazar_caso'),
-    path('dashboard/director/casos/<int:solicitud_id>/desactivar/', views.desactivar_caso, name='desactivar_caso'),
+    path('dashboard/director/casos/<int:solicitud_id>/aprobar/', views.transicion_solicitud, {'clave': 'aprobar_caso'}, name='aprobar_caso'),
+    path('dashboard/director/casos/<int:solicitud_id>/rechazar/', views.transicion_solicitud, {'clave': 'rechazar_caso'}, name='rechazar_caso'),
+    path('dashboard/director/casos/<int:solicitud_id>/desactivar/', views.transicion_solicitud, {'clave': 'desactivar_caso'}, name='desactivar_caso'),
     path('dashboard/director/ajustes/<int:ajuste_asignado_id>/aprobar/', views.aprobar_ajuste_director, name='aprobar_ajuste_director'),
     path('dashboard/director/ajustes/<int:ajuste_asignado_id>/rechazar/', views.rechazar_ajuste_director, name='rechazar_ajuste_director'),
     path('dashboard/director/carreras/', views.carreras_director, name='carreras_director'),
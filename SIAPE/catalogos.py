@@ -0,0 +1,80 @@
+# SIAPE/catalogos.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+
+from .models import CategoriasAjustes, PerfilUsuario
+
+# Tiempo (en segundos) que se mantienen en caché las categorías de ajustes.
+# Las señales de signals.py las invalidan al crear, editar o eliminar una categoría.
+CATEGORIAS_AJUSTES_CACHE_TIMEOUT = 600
+
+_CATEGORIAS_AJUSTES_CACHE_KEY = 'categorias_ajustes'
+
+# Tiempo (en segundos) que se mantiene en caché la lista de perfiles de cada rol.
+# Las señales de signals.py la invalidan al cambiar un perfil o un rol. Solo se usa con
+# una caché compartida (settings.CACHE_COMPARTIDA); si no, se consulta en cada llamada.
+PERFILES_ROL_CACHE_TIMEOUT = 60
+
+
+def obtener_categorias_ajustes():
+    """
+    Retorna las categorías de ajustes ordenadas por nombre, como lista de
+    diccionarios con 'id' y 'nombre_categoria' (para los selects de los formularios).
+    """
+    categorias = cache.get(_CATEGORIAS_AJUSTES_CACHE_KEY)
+    if categorias is None:
+        categorias = list(
+            CategoriasAjustes.objects.order_by('nombre_categoria').values('id', 'nombre_categoria')
+        )
+        cache.set(_CATEGORIAS_AJUSTES_CACHE_KEY, categorias, CATEGORIAS_AJUSTES_CACHE_TIMEOUT)
+    return categorias
+
+
+def invalidar_categorias_ajustes():
+    """Elimina de la caché la lista de categorías de ajustes."""
+    cache.delete(_CATEGORIAS_AJUSTES_CACHE_KEY)
+
+
+def obtener_o_crear_categoria(nombre):
+    """
+    Busca la categoría por nombre (sin distinguir mayúsculas/minúsculas) y la
+    crea si no existe. Retorna la tupla (categoria, creada).
+    Si otra petición la crea al mismo tiempo, el índice único cat_aj_nombre_lower_uk
+    rechaza el duplicado y se retorna la categoría ya creada.
+    """
+    categoria = CategoriasAjustes.objects.filter(nombre_categoria_lower=nombre.lower()).first()
+    if categoria is not None:
+        return categoria, False
+    try:
+        with transaction.atomic():
+            return CategoriasAjustes.objects.create(nombre_categoria=nombre), True
+    except IntegrityError:
+        return CategoriasAjustes.objects.get(nombre_categoria_lower=nombre.lower()), False
+
+
+def _perfiles_rol_cache_key(nombre_rol):
+    return f'ids_perfiles_rol_{slugify(nombre_rol)}'
+
+
+def obtener_ids_perfiles_rol(nombre_rol):
+    """
+    Retorna la lista (ordenada) de IDs de PerfilUsuario que tienen el rol indicado,
+    para filtrar con `coordinadora_id__in=...` sin repetir el JOIN con Roles en cada
+    consulta. Con una caché compartida se guarda entre requests.
+    """
+    def consultar_ids():
+        return list(PerfilUsuario.objects.filter(
+            rol__nombre_rol=nombre_rol
+        ).order_by('id').values_list('id', flat=True))
+
+    if not settings.CACHE_COMPARTIDA:
+        return consultar_ids()
+    return cache.get_or_set(_perfiles_rol_cache_key(nombre_rol), consultar_ids, PERFILES_ROL_CACHE_TIMEOUT)
+
+
+def invalidar_perfiles_roles(nombres_roles):
+    """Elimina de la caché la lista de perfiles de los roles indicados."""
+    cache.delete_many([_perfiles_rol_cache_key(nombre_rol) for nombre_rol in nombres_roles])
@@ -0,0 +1,45 @@
+# SIAPE/dashboards.py
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Tiempo (en segundos) que se mantienen en caché los KPIs de los dashboards.
+# Las señales de signals.py los invalidan al guardar o eliminar solicitudes y
+# ajustes asignados; los cambios sin señales (bulk_create) se reflejan al expirar.
+# La versión que invalidan es global solo con una caché compartida entre procesos
+# (settings.CACHE_COMPARTIDA); con LocMemCache los KPIs se calculan en cada request.
+KPIS_DASHBOARD_CACHE_TIMEOUT = 60
+
+_KPIS_VERSION_CACHE_KEY = 'kpis_dashboard_version'
+
+
+def _version_kpis():
+    """
+    Retorna la versión vigente de los KPIs. Se incluye en cada clave, de modo que
+    al incrementarla quedan obsoletos los KPIs de todos los usuarios a la vez.
+    """
+    version = cache.get(_KPIS_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(_KPIS_VERSION_CACHE_KEY, 1, None)
+        version = cache.get(_KPIS_VERSION_CACHE_KEY, 1)
+    return version
+
+
+def obtener_kpis_dashboard(dashboard, perfil_id, calcular):
+    """
+    Retorna los KPIs del dashboard indicado para el perfil, desde la caché si
+    están vigentes. En caso contrario los obtiene llamando a calcular().
+    """
+    if not settings.CACHE_COMPARTIDA:
+        return calcular()
+    clave = f'kpis_{dashboard}_{perfil_id}_v{_version_kpis()}'
+    return cache.get_or_set(clave, calcular, KPIS_DASHBOARD_CACHE_TIMEOUT)
+
+
+def invalidar_kpis_dashboard():
+    """Deja obsoletos los KPIs en caché de todos los dashboards."""
+    try:
+        cache.incr(_KPIS_VERSION_CACHE_KEY)
+    except ValueError:
+        # La versión no estaba en caché: la próxima lectura parte de nuevo
+        cache.add(_KPIS_VERSION_CACHE_KEY, 1, None)
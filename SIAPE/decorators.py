@@ -0,0 +1,45 @@
+# SIAPE/decorators.py
+
+from functools import wraps
+
+from django.contrib import messages
+from django.shortcuts import redirect
+
+from .middleware import obtener_rol_usuario
+
+
+def verificar_rol(request, *roles, mensaje='No tienes permisos para realizar esta acción.',
+                  permitir_superusuario=True):
+    """
+    Verifica que el rol del usuario esté en `roles`.
+    Retorna None si tiene acceso, o la redirección a 'home' (con `mensaje`) en caso contrario.
+    Los superusuarios sin perfil/rol también tienen acceso, salvo con permitir_superusuario=False.
+    """
+    if hasattr(request, 'user_rol'):
+        rol = request.user_rol
+    else:
+        rol = obtener_rol_usuario(request.user)
+
+    if rol is None:
+        if not (permitir_superusuario and request.user.is_superuser):
+            return redirect('home')
+    elif rol not in roles:
+        messages.error(request, mensaje)
+        return redirect('home')
+    return None
+
+
+def require_rol(*roles):
+    """
+    Restringe una vista a los usuarios cuyo rol esté en `roles`.
+    Usar debajo de @login_required.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            respuesta = verificar_rol(request, *roles)
+            if respuesta is not None:
+                return respuesta
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,64 @@
+# SIAPE/middleware.py
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import PerfilUsuario
+
+# Tiempo (en segundos) que se mantiene en caché el rol de cada usuario.
+# Las señales de signals.py lo invalidan al cambiar el perfil o el rol. Solo se usa con
+# una caché compartida (settings.CACHE_COMPARTIDA); si no, se consulta en cada request.
+ROL_USUARIO_CACHE_TIMEOUT = 300
+
+# Marcador para distinguir "usuario sin rol" de "no está en caché"
+_SIN_ROL = ''
+
+
+def _rol_cache_key(usuario_id):
+    return f'rol_usuario_{usuario_id}'
+
+
+def obtener_rol_usuario(user):
+    """
+    Retorna el nombre del rol del usuario (o None si no tiene perfil/rol).
+    Con una caché compartida el resultado se guarda por usuario para evitar
+    consultar PerfilUsuario y Roles en cada request.
+    """
+    if not user or not user.is_authenticated:
+        return None
+
+    def consultar_rol():
+        return PerfilUsuario.objects.filter(
+            usuario_id=user.pk
+        ).values_list('rol__nombre_rol', flat=True).first() or _SIN_ROL
+
+    if not settings.CACHE_COMPARTIDA:
+        # Un rol cacheado por proceso seguiría autorizando a un usuario degradado
+        # en los demás workers hasta expirar
+        return consultar_rol() or None
+
+    key = _rol_cache_key(user.pk)
+    rol = cache.get(key)
+    if rol is None:
+        rol = consultar_rol()
+        cache.set(key, rol, ROL_USUARIO_CACHE_TIMEOUT)
+    return rol or None
+
+
+def invalidar_rol_usuarios(usuario_ids):
+    """Elimina de la caché el rol de los usuarios indicados."""
+    cache.delete_many([_rol_cache_key(usuario_id) for usuario_id in usuario_ids])
+
+
+class RolUsuarioMiddleware:
+    """
+    Agrega `request.user_rol` con el nombre del rol del usuario autenticado.
+    Se obtiene una sola vez por request. Debe ubicarse después de AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user_rol = obtener_rol_usuario(request.user)
+        return self.get_response(request)
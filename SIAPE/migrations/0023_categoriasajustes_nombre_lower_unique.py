@@ -0,0 +1,65 @@
+# Generated manually
+
+import logging
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+logger = logging.getLogger(__name__)
+
+
+def unificar_categorias_duplicadas(apps, schema_editor):
+    """
+    Antes de crear el índice único, unifica las categorías que el índice
+    consideraría iguales: se conserva la más antigua y sus ajustes pasan a
+    apuntar a ella. Se agrupa en la base de datos por nombre_categoria_lower,
+    con la misma collation que usará el índice (en MySQL utf8mb4 por defecto
+    tampoco distingue acentos: "Evaluación" y "evaluacion" se unifican).
+    """
+    CategoriasAjustes = apps.get_model('SIAPE', 'CategoriasAjustes')
+    AjusteRazonable = apps.get_model('SIAPE', 'AjusteRazonable')
+
+    nombres_repetidos = CategoriasAjustes.objects.order_by().values('nombre_categoria_lower').annotate(
+        total=Count('id')
+    ).filter(total__gt=1).values_list('nombre_categoria_lower', flat=True)
+
+    for nombre_lower in list(nombres_repetidos):
+        original, *duplicadas = CategoriasAjustes.objects.filter(
+            nombre_categoria_lower=nombre_lower
+        ).order_by('id')
+        for categoria in duplicadas:
+            ajustes_ids = list(
+                AjusteRazonable.objects.filter(categorias_ajustes_id=categoria.id).values_list('id', flat=True)
+            )
+            AjusteRazonable.objects.filter(id__in=ajustes_ids).update(categorias_ajustes_id=original.id)
+            logger.warning(
+                'Categoría %s "%s" unificada en %s "%s"; ajustes reasignados: %s',
+                categoria.id, categoria.nombre_categoria,
+                original.id, original.nombre_categoria, ajustes_ids,
+            )
+            categoria.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SIAPE', '0022_decisiondocenteajuste'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categoriasajustes',
+            name='nombre_categoria_lower',
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=Lower('nombre_categoria'),
+                output_field=models.CharField(max_length=191),
+            ),
+        ),
+        migrations.RunPython(unificar_categorias_duplicadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='categoriasajustes',
+            constraint=models.UniqueConstraint(fields=['nombre_categoria_lower'], name='cat_aj_nombre_lower_uk'),
+        ),
+    ]
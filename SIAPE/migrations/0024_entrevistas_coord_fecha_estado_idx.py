@@ -0,0 +1,20 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SIAPE', '0023_categoriasajustes_nombre_lower_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entrevistas',
+            index=models.Index(
+                fields=['coordinadora', 'fecha_entrevista', 'estado'],
+                name='entrev_coord_fecha_estado_idx',
+            ),
+        ),
+    ]
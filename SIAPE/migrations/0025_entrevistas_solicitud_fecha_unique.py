@@ -0,0 +1,66 @@
+# Generated manually
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def verificar_citas_pendientes_duplicadas(apps, schema_editor):
+    """
+    Antes de crear el índice único, verifica que ningún caso tenga dos citas
+    pendientes en el mismo horario. Si las hay, detiene la migración y lista
+    los ids para que se revisen a mano: no se elimina ni se modifica ninguna cita.
+    """
+    Entrevistas = apps.get_model('SIAPE', 'Entrevistas')
+
+    repetidas = Entrevistas.objects.filter(estado='pendiente').order_by().values(
+        'solicitudes_id', 'fecha_entrevista'
+    ).annotate(total=Count('id')).filter(total__gt=1)
+
+    detalle = []
+    for grupo in repetidas:
+        ids = list(Entrevistas.objects.filter(
+            estado='pendiente',
+            solicitudes_id=grupo['solicitudes_id'],
+            fecha_entrevista=grupo['fecha_entrevista'],
+        ).order_by('id').values_list('id', flat=True))
+        detalle.append(f"solicitud {grupo['solicitudes_id']} ({grupo['fecha_entrevista']}): citas {ids}")
+
+    if detalle:
+        raise RuntimeError(
+            'Hay casos con más de una cita pendiente en el mismo horario. Cierre o '
+            'reagende las que sobran y vuelva a ejecutar la migración:\n  ' + '\n  '.join(detalle)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SIAPE', '0024_entrevistas_coord_fecha_estado_idx'),
+    ]
+
+    operations = [
+        # Primero la verificación: en MySQL el DDL no es transaccional, así que si
+        # falla no debe quedar la columna agregada a medias
+        migrations.RunPython(verificar_citas_pendientes_duplicadas, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='entrevistas',
+            name='cita_pendiente',
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(estado='pendiente', then=models.Value(True)),
+                    default=models.Value(None),
+                ),
+                output_field=models.BooleanField(null=True),
+            ),
+        ),
+        # Solo limita las citas pendientes: las citas repetidas en el mismo horario que
+        # dejó el reagendamiento (la original queda 'no_asistio') son historial válido.
+        migrations.AddConstraint(
+            model_name='entrevistas',
+            constraint=models.UniqueConstraint(
+                fields=['solicitudes', 'fecha_entrevista', 'cita_pendiente'],
+                name='entrev_solicitud_fecha_pend_uk',
+            ),
+        ),
+    ]
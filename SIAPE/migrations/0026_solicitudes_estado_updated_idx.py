@@ -0,0 +1,20 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SIAPE', '0025_entrevistas_solicitud_fecha_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='solicitudes',
+            index=models.Index(
+                fields=['estado', '-updated_at'],
+                name='solic_estado_updated_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('SIAPE', '0026_solicitudes_estado_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='solicitudes',
+            index=models.Index(fields=['created_at'], name='solic_created_at_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.conf import settings
 import uuid
@@ -98,11 +99,24 @@ class Areas(models.Model):
 
 class CategoriasAjustes(models.Model):
     nombre_categoria = models.CharField(max_length=191)
+    # Nombre en minúsculas calculado por la base de datos (columna generada), con índice
+    # único: impide categorías que solo difieren en mayúsculas/minúsculas en cualquier
+    # motor y collation. Se usa en lugar de un índice funcional sobre Lower(), que
+    # requiere MySQL 8.0.13+ y no existe en MariaDB. Al calcularlo la base de datos,
+    # también se mantiene con update() y bulk_create().
+    nombre_categoria_lower = models.GeneratedField(
+        expression=Lower('nombre_categoria'),
+        output_field=models.CharField(max_length=191),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'categorias_ajustes'
+        constraints = [
+            models.UniqueConstraint(fields=['nombre_categoria_lower'], name='cat_aj_nombre_lower_uk'),
+        ]
 
 
     def __str__(self):
@@ -244,6 +258,15 @@ class Solicitudes(models.Model):
     
     class Meta:
         db_table = 'solicitudes'
+        # Listas de casos por estado, los más recientes primero (dashboards)
+        indexes = [
+            models.Index(
+                fields=['estado', '-updated_at'],
+                name='solic_estado_updated_idx',
+            ),
+            # KPIs por rango de creación (casos de la semana/mes) y paginación de la API
+            models.Index(fields=['created_at'], name='solic_created_at_idx'),
+        ]
 
     def __str__(self):
             return f"Solicitud de {self.estudiantes}: {self.asunto}"
@@ -361,9 +384,35 @@ class Entrevistas(models.Model):
         on_delete=models.CASCADE,
         limit_choices_to={'rol__nombre_rol': 'Encargado de Inclusión'}
     )
+    # Marca calculada por la base de datos: True mientras la cita está pendiente y NULL
+    # al cerrarse. Forma parte del índice único de abajo; como los NULL no chocan entre
+    # sí, solo limita las citas pendientes (MySQL no soporta índices condicionales).
+    cita_pendiente = models.GeneratedField(
+        expression=models.Case(
+            models.When(estado='pendiente', then=models.Value(True)),
+            default=models.Value(None),
+        ),
+        output_field=models.BooleanField(null=True),
+        db_persist=True,
+    )
 
     class Meta:
         db_table = 'entrevistas'
+        # Búsquedas de agenda: citas de una coordinadora en un rango de fechas y estado
+        indexes = [
+            models.Index(
+                fields=['coordinadora', 'fecha_entrevista', 'estado'],
+                name='entrev_coord_fecha_estado_idx',
+            ),
+        ]
+        # Un caso no puede tener dos citas pendientes en el mismo horario. Las citas
+        # cerradas (no asistió, cancelada, realizada) se conservan como historial.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['solicitudes', 'fecha_entrevista', 'cita_pendiente'],
+                name='entrev_solicitud_fecha_pend_uk',
+            ),
+        ]
 
     def __str__(self):
             return f"Entrevista sobre {self.solicitudes}"
@@ -397,7 +446,8 @@ class HorarioBloqueado(models.Model):
         db_table = 'horarios_bloqueados'
         verbose_name = "Horario Bloqueado"
         verbose_name_plural = "Horarios Bloqueados"
-        # Evitar duplicados: una coordinadora no puede bloquear el mismo horario dos veces
+        # Evitar duplicados: una coordinadora no puede bloquear el mismo horario dos veces.
+        # El índice único (coordinadora, fecha_hora) también sirve a las búsquedas de bloqueo.
         unique_together = [['coordinadora', 'fecha_hora']]
 
     def __str__(self):
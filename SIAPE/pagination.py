@@ -0,0 +1,17 @@
+# SIAPE/pagination.py
+
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Paginación por cursor para los listados de la API, del más reciente al más
+    antiguo. No usa OFFSET ni COUNT(*): cada página es una consulta acotada
+    sobre created_at, sin importar cuántas filas tenga la tabla. El id desempata
+    los registros con el mismo created_at (p. ej. creados en bloque), para que
+    ninguno se repita ni se salte entre páginas.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
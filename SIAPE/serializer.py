@@ -5,6 +5,7 @@ from .models import (
     AsignaturasEnCurso, Entrevistas, AjusteRazonable, AjusteAsignado
 )
 from .validators import validar_contraseña
+from .catalogos import obtener_o_crear_categoria
 from datetime import datetime, timedelta, time
 from django.utils import timezone
 
@@ -447,8 +448,8 @@ class AjusteRazonableSerializer(serializers.ModelSerializer):
         nueva_categoria_nombre = validated_data.pop('nueva_categoria_nombre', None)
         
         if nueva_categoria_nombre:
-            categoria, created = CategoriasAjustes.objects.get_or_create(
-                nombre_categoria=nueva_categoria_nombre.strip().capitalize()
+            categoria, created = obtener_o_crear_categoria(
+                nueva_categoria_nombre.strip().capitalize()
             )
             validated_data['categorias_ajustes'] = categoria
 
@@ -0,0 +1,58 @@
+# SIAPE/signals.py
+
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import PerfilUsuario, Roles, CategoriasAjustes, Solicitudes, AjusteAsignado
+from .middleware import invalidar_rol_usuarios
+from .catalogos import invalidar_categorias_ajustes, invalidar_perfiles_roles
+from .dashboards import invalidar_kpis_dashboard
+
+
+# ----- INVALIDACIÓN DE CACHÉ DE ROLES -----
+
+@receiver(post_save, sender=PerfilUsuario)
+@receiver(post_delete, sender=PerfilUsuario)
+def invalidar_rol_perfil(sender, instance, **kwargs):
+    invalidar_rol_usuarios([instance.usuario_id])
+
+
+@receiver(post_save, sender=Roles)
+@receiver(pre_delete, sender=Roles)
+def invalidar_rol_renombrado(sender, instance, **kwargs):
+    # Al renombrar o eliminar un rol cambia el rol de todos sus usuarios
+    usuario_ids = PerfilUsuario.objects.filter(rol=instance).values_list('usuario_id', flat=True)
+    invalidar_rol_usuarios(list(usuario_ids))
+
+
+# ----- INVALIDACIÓN DE CACHÉ DE PERFILES POR ROL -----
+
+@receiver(post_save, sender=PerfilUsuario)
+@receiver(post_delete, sender=PerfilUsuario)
+def invalidar_perfiles_por_rol(sender, instance, **kwargs):
+    # No se conoce el rol anterior del perfil, así que se invalidan todos
+    invalidar_perfiles_roles(Roles.objects.values_list('nombre_rol', flat=True))
+
+
+@receiver(post_save, sender=Roles)
+@receiver(post_delete, sender=Roles)
+def invalidar_perfiles_rol_renombrado(sender, instance, **kwargs):
+    invalidar_perfiles_roles(Roles.objects.values_list('nombre_rol', flat=True))
+
+
+# ----- INVALIDACIÓN DE CACHÉ DE CATEGORÍAS DE AJUSTES -----
+
+@receiver(post_save, sender=CategoriasAjustes)
+@receiver(post_delete, sender=CategoriasAjustes)
+def invalidar_categorias(sender, instance, **kwargs):
+    invalidar_categorias_ajustes()
+
+
+# ----- INVALIDACIÓN DE CACHÉ DE KPIs DE DASHBOARDS -----
+
+@receiver(post_save, sender=Solicitudes)
+@receiver(post_delete, sender=Solicitudes)
+@receiver(post_save, sender=AjusteAsignado)
+@receiver(post_delete, sender=AjusteAsignado)
+def invalidar_kpis(sender, instance, **kwargs):
+    invalidar_kpis_dashboard()
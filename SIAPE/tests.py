@@ -1,6 +1,7 @@
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.contrib.messages import get_messages
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 from datetime import datetime, date, timedelta
@@ -396,6 +397,55 @@ class PermisosCoordinadoraTest(TestCase):
         print("[TEST] ✓✓✓ PRUEBA EXITOSA: Permisos de acceso funcionan correctamente")
 
 
+class RolUsuarioCacheTest(TestCase):
+    """Pruebas para el rol en caché que agrega RolUsuarioMiddleware"""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        from django.core.cache import cache
+        cache.clear()
+        
+        self.rol_coordinadora = Roles.objects.create(nombre_rol='Encargado de Inclusión')
+        self.rol_docente = Roles.objects.create(nombre_rol='Docente')
+        self.usuario = Usuario.objects.create_user(
+            email='rol@test.com',
+            password='test123',
+            first_name='Rol',
+            last_name='Test',
+            rut='33333333-3'
+        )
+        self.perfil = PerfilUsuario.objects.create(usuario=self.usuario, rol=self.rol_coordinadora)
+    
+    def test_cambio_de_rol_invalida_cache(self):
+        """Prueba que el rol se cachea y se invalida al cambiar el perfil"""
+        from .middleware import obtener_rol_usuario
+        
+        print("\n[TEST] Iniciando prueba: Caché del rol de usuario")
+        
+        with self.settings(CACHE_COMPARTIDA=True):
+            self.assertEqual(obtener_rol_usuario(self.usuario), 'Encargado de Inclusión')
+            print("[TEST] ✓ Rol inicial obtenido: Encargado de Inclusión")
+            
+            with self.assertNumQueries(0):
+                obtener_rol_usuario(self.usuario)
+            print("[TEST] ✓ Segunda lectura servida desde caché (0 consultas)")
+            
+            self.perfil.rol = self.rol_docente
+            self.perfil.save()
+            self.assertEqual(obtener_rol_usuario(self.usuario), 'Docente')
+            print("[TEST] ✓ Rol actualizado tras guardar el perfil: Docente")
+        print("[TEST] ✓✓✓ PRUEBA EXITOSA: La caché del rol se invalida correctamente")
+    
+    def test_sin_cache_compartida_consulta_el_rol(self):
+        """Prueba que sin caché compartida el rol no se cachea entre requests"""
+        from .middleware import obtener_rol_usuario
+        
+        with self.settings(CACHE_COMPARTIDA=False):
+            obtener_rol_usuario(self.usuario)
+            with self.assertNumQueries(1):
+                self.assertEqual(obtener_rol_usuario(self.usuario), 'Encargado de Inclusión')
+
+
 class EstudiantesModelTest(TestCase):
     """Pruebas para el modelo Estudiantes"""
     
@@ -534,6 +584,162 @@ class AgendamientoTest(TestCase):
         print(f"[TEST] ✓ No se creó una segunda cita (solo hay {citas_count} cita)")
         print("[TEST] ✓✓✓ PRUEBA EXITOSA: Validación de horario ocupado funciona correctamente")
 
+    def test_reagendar_mismo_horario_conserva_cita_original(self):
+        """Prueba que reagendar sobre el mismo horario conserve la cita original como historial"""
+        fecha_str = self.cita_existente.fecha_entrevista.strftime('%Y-%m-%d')
+        
+        response = self.client.post(
+            reverse('encargado_inclusion_reagendar_cita', args=[self.cita_existente.id]),
+            {
+                'fecha_reagendar': fecha_str,
+                'hora_reagendar': '10:00',
+                'nueva_modalidad': 'Virtual',
+            }
+        )
+        self.assertEqual(response.status_code, 302)
+        
+        # La original queda como 'no_asistio' y hay una sola cita pendiente en ese horario
+        citas = Entrevistas.objects.filter(
+            solicitudes=self.solicitud,
+            fecha_entrevista=self.cita_existente.fecha_entrevista
+        )
+        self.assertEqual(citas.count(), 2)
+        self.assertEqual(citas.filter(estado='pendiente').count(), 1)
+        self.cita_existente.refresh_from_db()
+        self.assertEqual(self.cita_existente.estado, 'no_asistio')
+
+
+class TransicionSolicitudTest(TestCase):
+    """Pruebas para la vista de transiciones de estado de una solicitud"""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.rol_ctp = Roles.objects.create(nombre_rol='Coordinador Técnico Pedagógico')
+        
+        self.usuario_ctp = Usuario.objects.create_user(
+            email='ctp@test.com',
+            password='test123',
+            first_name='Coordinador',
+            last_name='Test',
+            rut='22222222-2'
+        )
+        PerfilUsuario.objects.create(usuario=self.usuario_ctp, rol=self.rol_ctp)
+        
+        self.carrera = Carreras.objects.create(nombre='Ingeniería')
+        self.estudiante = Estudiantes.objects.create(
+            nombres='Estudiante',
+            apellidos='Test',
+            rut='12345678-9',
+            email='estudiante@test.com',
+            carreras=self.carrera
+        )
+        self.solicitud = Solicitudes.objects.create(
+            asunto='Solicitud de prueba',
+            estudiantes=self.estudiante,
+            autorizacion_datos=True,
+            estado='pendiente_formulacion_ajustes'
+        )
+        
+        self.client = Client()
+        self.client.login(email='ctp@test.com', password='test123')
+    
+    def _mensajes(self, response):
+        return [str(mensaje) for mensaje in get_messages(response.wsgi_request)]
+    
+    def test_transicion_exitosa_cambia_estado(self):
+        """Prueba que una transición válida cambia el estado y redirige"""
+        print("\n[TEST] Iniciando prueba: Transición exitosa de una solicitud")
+        
+        response = self.client.post(reverse('devolver_a_encargado_inclusion', args=[self.solicitud.id]))
+        
+        self.assertRedirects(
+            response,
+            reverse('detalle_casos_coordinador_tecnico_pedagogico', args=[self.solicitud.id]),
+            fetch_redirect_response=False
+        )
+        self.solicitud.refresh_from_db()
+        self.assertEqual(self.solicitud.estado, 'pendiente_formulacion_caso')
+        print("[TEST] ✓✓✓ PRUEBA EXITOSA: El caso quedó pendiente de formulación del caso")
+    
+    def test_estado_origen_incorrecto_informa_estado_invalido(self):
+        """Prueba que si el caso no está en el estado de origen se muestra mensaje_estado_invalido"""
+        print("\n[TEST] Iniciando prueba: Transición con estado de origen incorrecto")
+        Solicitudes.objects.filter(id=self.solicitud.id).update(estado='pendiente_formulacion_caso')
+        
+        response = self.client.post(reverse('devolver_a_encargado_inclusion', args=[self.solicitud.id]))
+        
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(
+            'Este caso no está en estado de formulación de ajustes. Solo se pueden devolver casos pendientes de formulación de ajustes.',
+            self._mensajes(response)
+        )
+        self.solicitud.refresh_from_db()
+        self.assertEqual(self.solicitud.estado, 'pendiente_formulacion_caso')
+        print("[TEST] ✓✓✓ PRUEBA EXITOSA: Se informó el estado inválido")
+    
+    def test_solicitud_inexistente_retorna_404(self):
+        """Prueba que una solicitud inexistente retorna 404"""
+        print("\n[TEST] Iniciando prueba: Transición sobre solicitud inexistente")
+        
+        response = self.client.post(reverse('devolver_a_encargado_inclusion', args=[self.solicitud.id + 999]))
+        
+        self.assertEqual(response.status_code, 404)
+        print("[TEST] ✓✓✓ PRUEBA EXITOSA: Se retornó 404")
+    
+    def test_enviar_a_asesor_sin_ajustes_se_bloquea(self):
+        """Prueba que no se puede enviar al Asesor Pedagógico un caso sin ajustes formulados"""
+        print("\n[TEST] Iniciando prueba: Envío al Asesor Pedagógico sin ajustes")
+        
+        response = self.client.post(reverse('enviar_a_asesor_pedagogico', args=[self.solicitud.id]))
+        
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(
+            'Debe formular al menos un ajuste antes de enviar el caso al Asesor Pedagógico.',
+            self._mensajes(response)
+        )
+        self.solicitud.refresh_from_db()
+        self.assertEqual(self.solicitud.estado, 'pendiente_formulacion_ajustes')
+        print("[TEST] ✓✓✓ PRUEBA EXITOSA: El caso no cambió de estado")
+
+
+class PaginacionApiTest(TestCase):
+    """Pruebas para la paginación por cursor de los listados de la API"""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.usuario = Usuario.objects.create_user(
+            email='api@test.com',
+            password='test123',
+            first_name='Api',
+            last_name='Test',
+            rut='33333333-3'
+        )
+        # Cinco roles con el mismo created_at: el id debe desempatar el orden
+        for numero in range(5):
+            Roles.objects.create(nombre_rol=f'Rol {numero}')
+        Roles.objects.update(created_at=timezone.now())
+        
+        self.client = Client()
+        self.client.login(email='api@test.com', password='test123')
+    
+    def test_listado_paginado_recorre_todos_los_registros(self):
+        """Prueba que el listado responde {next, previous, results} y que las páginas no repiten ni saltan registros"""
+        print("\n[TEST] Iniciando prueba: Paginación por cursor en /roles/")
+        
+        url = reverse('roles-list') + '?page_size=2'
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual(set(data), {'next', 'previous', 'results'})
+            ids.extend(fila['id'] for fila in data['results'])
+            url = data['next']
+        
+        esperados = list(Roles.objects.order_by('-id').values_list('id', flat=True))
+        self.assertEqual(ids, esperados)
+        print(f"[TEST] ✓✓✓ PRUEBA EXITOSA: Se recorrieron {len(ids)} roles sin repetidos")
+
 
 class URLReverseTest(TestCase):
     """Pruebas para reverse de URLs"""
@@ -7,11 +7,16 @@ from django.contrib.auth import logout, login
 from django.contrib.auth import update_session_auth_hash
 from django.utils import timezone
 from django.urls import reverse
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, Http404
+from django.db import DatabaseError, IntegrityError, transaction
+from django.core.exceptions import ValidationError
 from datetime import timedelta, datetime, time, date
 from collections import Counter
-from django.db.models import Count, Q
+from functools import lru_cache
+from django.db.models import Count, Q, Exists, OuterRef, Prefetch, Value
+from django.db.models.functions import Concat
 from django.views.decorators.http import require_POST
+from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 import json
@@ -52,11 +57,16 @@ from .models import(
 )  
 
 # Permisos personalizados
+from .decorators import verificar_rol
+from .catalogos import obtener_categorias_ajustes, obtener_o_crear_categoria, obtener_ids_perfiles_rol
+from .dashboards import obtener_kpis_dashboard, invalidar_kpis_dashboard
 from .permissions import (
     IsAsesorPedagogico, IsDocente, IsDirectorCarrera, 
     IsCoordinadora, IsAsesorTecnico, IsAdminOrReadOnly
 )
 
+logger = logging.getLogger(__name__)
+
 # ------------ CONSTANTES ------------
 ROL_ASESOR = 'Asesor Pedagógico'
 ROL_DIRECTOR = 'Director de Carrera'
@@ -123,6 +133,39 @@ def desactivar_asignaturas_semestre_vencido():
     return asignaturas_desactivadas
 
 
+@lru_cache(maxsize=8)
+def _limites_dia(fecha, tz):
+    """
+    Retorna el inicio y fin (aware) del día indicado en la zona horaria tz.
+    Se memoriza por (fecha, tz): los requests del mismo día reutilizan el resultado.
+    """
+    return (
+        datetime.combine(fecha, time.min, tzinfo=tz),
+        datetime.combine(fecha, time.max, tzinfo=tz),
+    )
+
+
+@lru_cache(maxsize=8)
+def _limites_semana(fecha, tz):
+    """
+    Retorna el inicio del lunes y el fin del domingo (aware) de la semana
+    que contiene la fecha indicada, en la zona horaria tz.
+    """
+    lunes = fecha - timedelta(days=fecha.weekday())
+    return (
+        datetime.combine(lunes, time.min, tzinfo=tz),
+        datetime.combine(lunes + timedelta(days=6), time.max, tzinfo=tz),
+    )
+
+
+def _parsear_fecha_hora(fecha_str, hora_str):
+    """
+    Convierte la fecha (YYYY-MM-DD) y la hora (HH:MM) enviadas por los formularios
+    de agenda. Lanza ValueError si alguno de los dos no tiene formato ISO.
+    """
+    return date.fromisoformat(fecha_str), time.fromisoformat(hora_str)
+
+
 # ----------------------------------------------
 #           Vistas Públicas del Sistema
 # ----------------------------------------------
@@ -575,12 +618,23 @@ def get_calendario_disponible(request):
 
 
 # ----------- Vistas para la página ------------
+# La página no tiene formularios (sin token CSRF) ni muestra mensajes. Para visitantes
+# anónimos es idéntica, así que se cachea una sola copia para todos.
+@cache_page(60 * 15)
+def _pagina_index_anonima(request):
+    return render(request, 'SIAPE/index.html')
+
+
 def pagina_index(request):
     """
     Página principal (index) del sistema.
     Muestra descripción del sistema y botones de acceso.
     """
-    return render(request, 'SIAPE/index.html')
+    # Con sesión iniciada el encabezado muestra datos del usuario (nombre, rol,
+    # enlace a su dashboard): se genera siempre para no mostrar datos desactualizados
+    if request.user.is_authenticated:
+        return render(request, 'SIAPE/index.html')
+    return _pagina_index_anonima(request)
 
 def seguimiento_caso_estudiante(request):
     """
@@ -852,7 +906,7 @@ def casos_generales(request):
         solicitudes_list = solicitudes_list.filter(filtros)
     # Si no hay filtros (solo para Admin con tiene_todos=True), mostrar todos los casos sin filtrar
 
-    categorias_ajustes = CategoriasAjustes.objects.all().order_by('nombre_categoria')
+    categorias_ajustes = obtener_categorias_ajustes()
 
     # Obtener opciones de estado para el filtro
     estados_disponibles = Solicitudes.ESTADO_CHOICES
@@ -1224,8 +1278,9 @@ def agregar_usuario_admin(request):
             )
             messages.success(request, f'Usuario {email} creado y asignado con el rol de {rol_obj.nombre_rol}.', extra_tags='usuarios')
             
-        except Exception as e:
-            messages.error(request, f'Error al crear el usuario: {str(e)}', extra_tags='usuarios')
+        except (DatabaseError, ValidationError, ValueError):
+            logger.exception('Error al crear el usuario')
+            messages.error(request, 'Error al crear el usuario. Revise los datos e intente nuevamente.', extra_tags='usuarios')
     
     return redirect(reverse('gestion_usuarios_admin') + '#seccion-usuarios')
 
@@ -1287,8 +1342,9 @@ def editar_usuario_admin(request, perfil_id):
             
             messages.success(request, f'Se actualizó correctamente al usuario {usuario.email}.', extra_tags='usuarios')
             
-        except Exception as e:
-            messages.error(request, f'Error al actualizar el usuario: {str(e)}', extra_tags='usuarios')
+        except (DatabaseError, ValidationError, ValueError):
+            logger.exception('Error al actualizar el usuario')
+            messages.error(request, 'Error al actualizar el usuario. Revise los datos e intente nuevamente.', extra_tags='usuarios')
             
     return redirect(redirect_url)
 
@@ -1325,8 +1381,9 @@ def activar_desactivar_usuario_admin(request, perfil_id):
         estado_texto = 'activado' if usuario.is_active else 'desactivado'
         messages.success(request, f'Usuario {usuario.email} ha sido {estado_texto} correctamente.', extra_tags='usuarios')
         
-    except Exception as e:
-        messages.error(request, f'Error al cambiar el estado del usuario: {str(e)}', extra_tags='usuarios')
+    except (DatabaseError, ValidationError, ValueError):
+        logger.exception('Error al cambiar el estado del usuario')
+        messages.error(request, 'Error al cambiar el estado del usuario. Revise los datos e intente nuevamente.', extra_tags='usuarios')
     
     return redirect(redirect_url)
 
@@ -1578,8 +1635,9 @@ def eliminar_rol_admin(request, rol_id):
     
     except ValueError:
         messages.error(request, 'ID de rol inválido.', extra_tags='roles')
-    except Exception as e:
-        messages.error(request, f'Error al eliminar el rol: {str(e)}', extra_tags='roles')
+    except (DatabaseError, ValidationError):
+        logger.exception('Error al eliminar el rol')
+        messages.error(request, 'Error al eliminar el rol. Intente nuevamente.', extra_tags='roles')
     
     return redirect(reverse('gestion_usuarios_admin') + '#seccion-roles')
 @login_required
@@ -1605,8 +1663,9 @@ def agregar_area_admin(request):
             try:
                 Areas.objects.create(nombre=nombre)
                 messages.success(request, f'Área "{nombre}" creada exitosamente.', extra_tags='areas')
-            except Exception as e:
-                messages.error(request, f'Error al crear el área: {str(e)}', extra_tags='areas')
+            except (DatabaseError, ValidationError, ValueError):
+                logger.exception('Error al crear el área')
+                messages.error(request, 'Error al crear el área. Revise los datos e intente nuevamente.', extra_tags='areas')
     
     return redirect(reverse('gestion_institucional_admin') + '#seccion-areas')
 
@@ -1642,12 +1701,14 @@ def editar_area_admin(request, area_id):
                     area.nombre = nombre
                     area.save()
                     messages.success(request, f'Área actualizada a "{nombre}".', extra_tags='areas')
-                except Exception as e:
-                    messages.error(request, f'Error al actualizar el área: {str(e)}', extra_tags='areas')
+                except (DatabaseError, ValidationError, ValueError):
+                    logger.exception('Error al actualizar el área')
+                    messages.error(request, 'Error al actualizar el área. Revise los datos e intente nuevamente.', extra_tags='areas')
     except ValueError:
         messages.error(request, 'ID de área inválido.', extra_tags='areas')
-    except Exception as e:
-        messages.error(request, f'Error: {str(e)}', extra_tags='areas')
+    except DatabaseError:
+        logger.exception('Error al editar el área')
+        messages.error(request, 'Error al editar el área. Intente nuevamente.', extra_tags='areas')
     
     return redirect(reverse('gestion_institucional_admin') + '#seccion-areas')
 
@@ -1688,8 +1749,9 @@ def eliminar_area_admin(request, area_id):
     
     except ValueError:
         messages.error(request, 'ID de área inválido.', extra_tags='areas')
-    except Exception as e:
-        messages.error(request, f'Error al eliminar el área: {str(e)}', extra_tags='areas')
+    except (DatabaseError, ValidationError):
+        logger.exception('Error al eliminar el área')
+        messages.error(request, 'Error al eliminar el área. Intente nuevamente.', extra_tags='areas')
     
     return redirect(reverse('gestion_institucional_admin') + '#seccion-areas')
 
@@ -1709,8 +1771,9 @@ def agregar_carrera_admin(request):
                 director = get_object_or_404(PerfilUsuario, id=director_id, rol__nombre_rol=ROL_DIRECTOR)
             Carreras.objects.create(nombre=nombre, area=area, director=director)
             messages.success(request, f'Carrera "{nombre}" creada exitosamente.', extra_tags='carreras')
-        except Exception as e:
-            messages.error(request, f'Error al crear la carrera: {str(e)}', extra_tags='carreras')
+        except (DatabaseError, ValidationError, ValueError):
+            logger.exception('Error al crear la carrera')
+            messages.error(request, 'Error al crear la carrera. Revise los datos e intente nuevamente.', extra_tags='carreras')
     return redirect(reverse('gestion_institucional_admin') + '#seccion-carreras')
 @login_required
 def editar_carrera_admin(request, carrera_id):
@@ -1732,8 +1795,9 @@ def editar_carrera_admin(request, carrera_id):
             carrera.director = director
             carrera.save()
             messages.success(request, f'Carrera "{nombre}" actualizada exitosamente.', extra_tags='carreras')
-        except Exception as e:
-            messages.error(request, f'Error al actualizar la carrera: {str(e)}', extra_tags='carreras')
+        except (DatabaseError, ValidationError, ValueError):
+            logger.exception('Error al actualizar la carrera')
+            messages.error(request, 'Error al actualizar la carrera. Revise los datos e intente nuevamente.', extra_tags='carreras')
     return redirect(reverse('gestion_institucional_admin') + '#seccion-carreras')
 
 @require_POST
@@ -1773,8 +1837,9 @@ def eliminar_carrera_admin(request, carrera_id):
     
     except ValueError:
         messages.error(request, 'ID de carrera inválido.', extra_tags='carreras')
-    except Exception as e:
-        messages.error(request, f'Error al eliminar la carrera: {str(e)}', extra_tags='carreras')
+    except (DatabaseError, ValidationError):
+        logger.exception('Error al eliminar la carrera')
+        messages.error(request, 'Error al eliminar la carrera. Intente nuevamente.', extra_tags='carreras')
     
     return redirect(reverse('gestion_institucional_admin') + '#seccion-carreras')
 
@@ -1813,8 +1878,9 @@ def agregar_asignatura_admin(request):
                 is_active=True  # Activa por defecto al crearse
             )
             messages.success(request, f'Asignatura "{nombre} - {seccion}" creada para {semestre_actual.capitalize()} {anio_actual}.', extra_tags='asignaturas')
-        except Exception as e:
-            messages.error(request, f'Error al crear la asignatura: {str(e)}', extra_tags='asignaturas')
+        except (DatabaseError, ValidationError, ValueError):
+            logger.exception('Error al crear la asignatura')
+            messages.error(request, 'Error al crear la asignatura. Revise los datos e intente nuevamente.', extra_tags='asignaturas')
     return redirect(reverse('gestion_institucional_admin') + '#seccion-asignaturas')
 @login_required
 def editar_asignatura_admin(request, asignatura_id):
@@ -1836,8 +1902,9 @@ def editar_asignatura_admin(request, asignatura_id):
             asignatura.docente = docente
             asignatura.save()
             messages.success(request, f'Asignatura "{nombre} - {seccion}" actualizada.', extra_tags='asignaturas')
-        except Exception as e:
-            messages.error(request, f'Error al actualizar la asignatura: {str(e)}', extra_tags='asignaturas')
+        except (DatabaseError, ValidationError, ValueError):
+            logger.exception('Error al actualizar la asignatura')
+            messages.error(request, 'Error al actualizar la asignatura. Revise los datos e intente nuevamente.', extra_tags='asignaturas')
     return redirect(reverse('gestion_institucional_admin') + '#seccion-asignaturas')
 
 @require_POST
@@ -1879,13 +1946,13 @@ def eliminar_asignatura_admin(request, asignatura_id):
     
     except ValueError:
         messages.error(request, 'ID de asignatura inválido.', extra_tags='asignaturas')
-    except Exception as e:
-        messages.error(request, f'Error al eliminar la asignatura: {str(e)}', extra_tags='asignaturas')
+    except (DatabaseError, ValidationError):
+        logger.exception('Error al eliminar la asignatura')
+        messages.error(request, 'Error al eliminar la asignatura. Intente nuevamente.', extra_tags='asignaturas')
     
     return redirect(reverse('gestion_institucional_admin') + '#seccion-asignaturas')
 
 # --- VISTA COORDINADORA DE INCLUSIÓN ---
-logger = logging.getLogger(__name__)
 
 @login_required
 def dashboard_encargado_inclusion(request):
@@ -1895,36 +1962,28 @@ def dashboard_encargado_inclusion(request):
     """
     
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADORA:
-            # Si no es coordinadora, redirige a home
-            messages.error(request, 'No tienes permisos para acceder a este panel.')
-            return redirect('home')
-    except AttributeError:
-        # Si el usuario no tiene perfil o rol
-        logger.warning(f"Usuario {request.user.email} sin perfil/rol intentó acceder al dashboard de coordinadora.")
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_COORDINADORA,
+        mensaje='No tienes permisos para acceder a este panel.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
 
     # 2. --- Configuración de Fechas ---
     now = timezone.localtime(timezone.now())
     today = now.date()
-    start_of_today = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-    end_of_today = timezone.make_aware(datetime.combine(today, datetime.max.time()))
+    start_of_today, end_of_today = _limites_dia(today, now.tzinfo)
     
     # Cálculo de la semana (Lunes a Domingo)
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
-    start_of_week_dt = timezone.make_aware(datetime.combine(start_of_week, datetime.min.time()))
-    end_of_week_dt = timezone.make_aware(datetime.combine(end_of_week, datetime.max.time()))
+    start_of_week_dt, end_of_week_dt = _limites_semana(today, now.tzinfo)
 
     # 3. --- Obtener Datos para KPIs ---
     
     # Base de entrevistas para todas las coordinadoras (filtramos por rol)
     # Como todas las coordinadoras deben ver todas las entrevistas del rol
-    todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
     entrevistas_coordinadora = Entrevistas.objects.filter(
-        coordinadora__in=todas_las_coordinadoras
+        coordinadora_id__in=obtener_ids_perfiles_rol(ROL_COORDINADORA)
     ).exclude(coordinadora__isnull=True)
     
     # KPI 1: Citas del día (Query que usaremos también para la lista)
@@ -1936,7 +1995,9 @@ def dashboard_encargado_inclusion(request):
         'solicitudes__estudiantes__carreras'
     ).order_by('fecha_entrevista')
     
-    kpi_citas_hoy = citas_hoy_qs.count()
+    # Se evalúa una sola vez: el conteo sale de la lista y el template la recorre sin re-consultar
+    citas_hoy_list = list(citas_hoy_qs)
+    kpi_citas_hoy = len(citas_hoy_list)
 
     # KPI 2: Citas canceladas esta semana
     kpi_citas_canceladas = entrevistas_coordinadora.filter(
@@ -1944,19 +2005,19 @@ def dashboard_encargado_inclusion(request):
         updated_at__range=(start_of_week_dt, end_of_week_dt)
     ).count()
 
-    # KPI 3: Casos pendientes de Formulación del caso
-    # Contamos las solicitudes que están en estado 'pendiente_formulacion_caso'
-    kpi_pendientes_formulacion_caso = Solicitudes.objects.filter(
+    # KPI 3 y 4 en una sola consulta (agregación condicional):
+    # - Casos pendientes de Formulación del caso ('pendiente_formulacion_caso')
+    # - Casos devueltos desde Coordinador Técnico Pedagógico: los mismos casos que además
+    #   tienen ajustes asignados (fueron formulados por la asesora técnica y luego devueltos)
+    tiene_ajustes = Exists(AjusteAsignado.objects.filter(solicitudes=OuterRef('pk')))
+    kpis_solicitudes = Solicitudes.objects.filter(
         estado='pendiente_formulacion_caso'
-    ).count()
-    
-    # KPI 4: Casos devueltos desde Coordinador Técnico Pedagógico
-    # Casos que están en 'pendiente_formulacion_caso' y que tienen ajustes asignados
-    # (lo que indica que fueron formulados por la asesora técnica y luego devueltos)
-    kpi_casos_devueltos_coordinador_tecnico_pedagogico = Solicitudes.objects.filter(
-        estado='pendiente_formulacion_caso',
-        ajusteasignado__isnull=False
-    ).distinct().count()
+    ).aggregate(
+        pendientes=Count('id'),
+        devueltos=Count('id', filter=Q(tiene_ajustes)),
+    )
+    kpi_pendientes_formulacion_caso = kpis_solicitudes['pendientes']
+    kpi_casos_devueltos_coordinador_tecnico_pedagogico = kpis_solicitudes['devueltos']
 
     # 4. --- Preparar Contexto ---
     context = {
@@ -1967,7 +2028,7 @@ def dashboard_encargado_inclusion(request):
             'pendientes_formulacion_caso': kpi_pendientes_formulacion_caso,
             'casos_devueltos_coordinador_tecnico_pedagogico': kpi_casos_devueltos_coordinador_tecnico_pedagogico,
         },
-        'citas_del_dia_list': citas_hoy_qs, # Esta es la lista para la sección principal
+        'citas_del_dia_list': citas_hoy_list, # Esta es la lista para la sección principal
     }
 
     # 5. --- Renderizar Template ---
@@ -1990,17 +2051,19 @@ def cancelar_cita_dashboard(request, entrevista_id):
     # 2. Lógica de la Acción
     try:
         # Cualquier coordinadora del rol puede cancelar cualquier entrevista del rol
-        todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
-        entrevista = get_object_or_404(Entrevistas, id=entrevista_id, coordinadora__in=todas_las_coordinadoras)
+        entrevista = get_object_or_404(
+            Entrevistas, id=entrevista_id, coordinadora_id__in=obtener_ids_perfiles_rol(ROL_COORDINADORA)
+        )
         
         if entrevista.estado == 'pendiente':
             entrevista.estado = 'cancelada'
-            entrevista.save()
+            entrevista.save(update_fields=['estado', 'updated_at'])
             messages.success(request, 'Cita cancelada exitosamente.')
         else:
             messages.warning(request, 'Esta cita no puede ser cancelada porque ya fue realizada o cancelada anteriormente.')
-    except Exception as e:
-        messages.error(request, f'Error al cancelar la cita: {str(e)}')
+    except Exception:
+        logger.exception('Error al cancelar la cita')
+        messages.error(request, 'Error al cancelar la cita. Intente nuevamente.')
         
     # 3. Redirigir siempre al dashboard
     return redirect('dashboard_encargado_inclusion')
@@ -2030,7 +2093,21 @@ def detalle_casos_encargado_inclusion(request, solicitud_id):
             return redirect('home')
 
     # 2. --- Obtener Datos del Caso y Validar Acceso ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
+    # Los ajustes asignados se precargan junto con la solicitud, solo con las columnas que usa el template
+    ajustes_qs = AjusteAsignado.objects.select_related(
+        'ajuste_razonable__categorias_ajustes',
+        'director_aprobador__usuario'
+    ).only(
+        'id', 'solicitudes', 'estado_aprobacion', 'comentarios_director', 'fecha_aprobacion', 'created_at',
+        'ajuste_razonable__descripcion',
+        'ajuste_razonable__categorias_ajustes__nombre_categoria',
+        'director_aprobador__usuario__first_name',
+        'director_aprobador__usuario__last_name'
+    )
+    solicitud = get_object_or_404(
+        Solicitudes.objects.prefetch_related(Prefetch('ajusteasignado_set', queryset=ajustes_qs)),
+        id=solicitud_id
+    )
     
     # Validar que el usuario tiene acceso a esta solicitud específica
     tiene_acceso = False
@@ -2077,22 +2154,16 @@ def detalle_casos_encargado_inclusion(request, solicitud_id):
     # 3. --- Determinar acciones permitidas según el rol ---
     rol_nombre = perfil.rol.nombre_rol if perfil else None
     
-    # Obtenemos los ajustes asignados
+    # Obtenemos los ajustes asignados (ya precargados con la solicitud)
     # Si el usuario es docente, solo mostrar ajustes aprobados
     # Para otros roles, mostrar todos los ajustes
     if rol_nombre == ROL_DOCENTE:
-        ajustes = AjusteAsignado.objects.filter(
-            solicitudes=solicitud,
-            estado_aprobacion='aprobado'
-        ).select_related(
-            'ajuste_razonable', 
-            'ajuste_razonable__categorias_ajustes'
-        )
+        ajustes = [
+            ajuste for ajuste in solicitud.ajusteasignado_set.all()
+            if ajuste.estado_aprobacion == 'aprobado'
+        ]
     else:
-        ajustes = AjusteAsignado.objects.filter(solicitudes=solicitud).select_related(
-            'ajuste_razonable', 
-            'ajuste_razonable__categorias_ajustes'
-        )
+        ajustes = solicitud.ajusteasignado_set.all()
     
     # Obtenemos todas las evidencias
     evidencias = Evidencias.objects.filter(solicitudes=solicitud)
@@ -2101,7 +2172,7 @@ def detalle_casos_encargado_inclusion(request, solicitud_id):
     entrevistas = Entrevistas.objects.filter(solicitudes=solicitud).order_by('-fecha_entrevista')
     
     # Obtenemos las categorías para el modal (si queremos añadir ajustes)
-    categorias_ajustes = CategoriasAjustes.objects.all().order_by('nombre_categoria')
+    categorias_ajustes = obtener_categorias_ajustes()
     # Permisos de edición: Solo Encargado de Inclusión, Asesor Pedagógico y Admin pueden editar la descripción del caso
     # El Coordinador Técnico Pedagógico NO puede editar el caso formulado por el Encargado de Inclusión
     # Estados editables por el Encargado de Inclusión
@@ -2274,9 +2345,9 @@ def subir_archivo_caso(request, solicitud_id):
             solicitudes=solicitud
         )
         messages.success(request, f'Archivo "{filename}" subido exitosamente.')
-    except Exception as e:
-        logger.error(f"Error al subir archivo: {str(e)}")
-        messages.error(request, f'Error al subir el archivo: {str(e)}')
+    except Exception:
+        logger.exception('Error al subir el archivo')
+        messages.error(request, 'Error al subir el archivo. Revise el formato del archivo e intente nuevamente.')
     
     return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
 
@@ -2287,15 +2358,12 @@ def detalle_casos_coordinador_tecnico_pedagogico(request, solicitud_id):
     Es un wrapper que redirige a la misma vista pero con un contexto diferente.
     """
     # Verificar que el usuario es Coordinador Técnico Pedagógico
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para acceder a esta página.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(
+        request, ROL_COORDINADOR_TECNICO_PEDAGOGICO,
+        mensaje='No tienes permisos para acceder a esta página.'
+    )
+    if respuesta is not None:
+        return respuesta
     
     # Llamar a la misma función pero con el contexto específico
     return detalle_casos_encargado_inclusion(request, solicitud_id)
@@ -2307,15 +2375,10 @@ def formular_ajuste_coordinador_tecnico_pedagogico(request, solicitud_id):
     Vista para que el Coordinador Técnico Pedagógico pueda crear y asignar ajustes a un caso.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, ROL_COORDINADOR_TECNICO_PEDAGOGICO)
+    if respuesta is not None:
+        return respuesta
+    perfil = getattr(request.user, 'perfil', None)
 
     # 2. --- Obtener la Solicitud ---
     solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
@@ -2356,9 +2419,7 @@ def formular_ajuste_coordinador_tecnico_pedagogico(request, solicitud_id):
             if not nueva_categoria:
                 messages.error(request, 'Debe proporcionar el nombre de la nueva categoría.')
                 return redirect('detalle_caso', solicitud_id=solicitud_id)
-            categoria, created = CategoriasAjustes.objects.get_or_create(
-                nombre_categoria=nueva_categoria.strip().capitalize()
-            )
+            categoria, created = obtener_o_crear_categoria(nueva_categoria.strip().capitalize())
             if created:
                 messages.info(request, f'Categoría "{categoria.nombre_categoria}" creada exitosamente.')
         else:
@@ -2382,13 +2443,13 @@ def formular_ajuste_coordinador_tecnico_pedagogico(request, solicitud_id):
         # 8. --- Asignar Coordinador Técnico Pedagógico al caso si no está asignado ---
         if not solicitud.coordinador_tecnico_pedagogico_asignado:
             solicitud.coordinador_tecnico_pedagogico_asignado = perfil
-            solicitud.save()
+            solicitud.save(update_fields=['coordinador_tecnico_pedagogico_asignado', 'updated_at'])
 
         messages.success(request, 'Ajuste formulado y asignado exitosamente.')
 
-    except Exception as e:
-        logger.error(f"Error al formular ajuste: {str(e)}")
-        messages.error(request, f'Error al formular el ajuste: {str(e)}')
+    except Exception:
+        logger.exception('Error al formular el ajuste')
+        messages.error(request, 'Error al formular el ajuste. Intente nuevamente.')
 
     # 9. --- Redirigir de vuelta al detalle ---
     return redirect('detalle_casos_coordinador_tecnico_pedagogico', solicitud_id=solicitud_id)
@@ -2400,18 +2461,18 @@ def editar_ajuste_coordinador_tecnico_pedagogico(request, ajuste_asignado_id):
     Vista para que el Coordinador Técnico Pedagógico pueda editar un ajuste ya asignado.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, ROL_COORDINADOR_TECNICO_PEDAGOGICO)
+    if respuesta is not None:
+        return respuesta
 
     # 2. --- Obtener el Ajuste Asignado ---
-    ajuste_asignado = get_object_or_404(AjusteAsignado, id=ajuste_asignado_id)
+    # Solo se necesitan el estado del caso y el ajuste razonable a modificar
+    ajuste_asignado = get_object_or_404(
+        AjusteAsignado.objects.select_related('ajuste_razonable', 'solicitudes').only(
+            'id', 'solicitudes__id', 'solicitudes__estado', 'ajuste_razonable__id'
+        ),
+        id=ajuste_asignado_id
+    )
     solicitud = ajuste_asignado.solicitudes
     
     # Verificar que el caso está en el estado correcto
@@ -2450,9 +2511,7 @@ def editar_ajuste_coordinador_tecnico_pedagogico(request, ajuste_asignado_id):
             if not nueva_categoria:
                 messages.error(request, 'Debe proporcionar el nombre de la nueva categoría.')
                 return redirect('detalle_casos_coordinador_tecnico_pedagogico', solicitud_id=solicitud.id)
-            categoria, created = CategoriasAjustes.objects.get_or_create(
-                nombre_categoria=nueva_categoria.strip().capitalize()
-            )
+            categoria, created = obtener_o_crear_categoria(nueva_categoria.strip().capitalize())
             if created:
                 messages.info(request, f'Categoría "{categoria.nombre_categoria}" creada exitosamente.')
         else:
@@ -2465,17 +2524,30 @@ def editar_ajuste_coordinador_tecnico_pedagogico(request, ajuste_asignado_id):
         ajuste_razonable = ajuste_asignado.ajuste_razonable
         ajuste_razonable.descripcion = descripcion
         ajuste_razonable.categorias_ajustes = categoria
-        ajuste_razonable.save()
+        ajuste_razonable.save(update_fields=['descripcion', 'categorias_ajustes', 'updated_at'])
 
         messages.success(request, 'Ajuste actualizado exitosamente.')
 
-    except Exception as e:
-        logger.error(f"Error al editar ajuste: {str(e)}")
-        messages.error(request, f'Error al editar el ajuste: {str(e)}')
+    except Exception:
+        logger.exception('Error al editar el ajuste')
+        messages.error(request, 'Error al editar el ajuste. Intente nuevamente.')
 
     # 7. --- Redirigir de vuelta al detalle ---
     return redirect('detalle_casos_coordinador_tecnico_pedagogico', solicitud_id=solicitud.id)
 
+def _eliminar_ajuste_asignado(ajuste_asignado):
+    """
+    Elimina un ajuste asignado y, en la misma transacción, su ajuste razonable
+    si ya no está siendo usado por otros ajustes asignados.
+    """
+    with transaction.atomic():
+        ajuste_razonable_id = ajuste_asignado.ajuste_razonable_id
+        ajuste_asignado.delete()
+        # El DELETE solo afecta al ajuste razonable si quedó huérfano
+        AjusteRazonable.objects.filter(id=ajuste_razonable_id).filter(
+            ~Exists(AjusteAsignado.objects.filter(ajuste_razonable=OuterRef('pk')))
+        ).delete()
+
 @require_POST
 @login_required
 def eliminar_ajuste_coordinador_tecnico_pedagogico(request, ajuste_asignado_id):
@@ -2483,18 +2555,18 @@ def eliminar_ajuste_coordinador_tecnico_pedagogico(request, ajuste_asignado_id):
     Vista para que el Coordinador Técnico Pedagógico pueda eliminar un ajuste asignado.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, ROL_COORDINADOR_TECNICO_PEDAGOGICO)
+    if respuesta is not None:
+        return respuesta
 
     # 2. --- Obtener el Ajuste Asignado ---
-    ajuste_asignado = get_object_or_404(AjusteAsignado, id=ajuste_asignado_id)
+    # Solo se necesitan el estado del caso y el id del ajuste razonable
+    ajuste_asignado = get_object_or_404(
+        AjusteAsignado.objects.select_related('solicitudes').only(
+            'id', 'ajuste_razonable', 'solicitudes__id', 'solicitudes__estado'
+        ),
+        id=ajuste_asignado_id
+    )
     solicitud = ajuste_asignado.solicitudes
     
     # Verificar que el caso está en el estado correcto
@@ -2504,228 +2576,162 @@ def eliminar_ajuste_coordinador_tecnico_pedagogico(request, ajuste_asignado_id):
 
     try:
         # 3. --- Eliminar el Ajuste Asignado y el Ajuste Razonable asociado ---
-        ajuste_razonable = ajuste_asignado.ajuste_razonable
         solicitud_id = solicitud.id
-        ajuste_asignado.delete()
-        # También eliminamos el ajuste razonable si no está siendo usado por otros ajustes asignados
-        if not AjusteAsignado.objects.filter(ajuste_razonable=ajuste_razonable).exists():
-            ajuste_razonable.delete()
+        _eliminar_ajuste_asignado(ajuste_asignado)
         
         messages.success(request, 'Ajuste eliminado exitosamente.')
 
-    except Exception as e:
-        logger.error(f"Error al eliminar ajuste: {str(e)}")
-        messages.error(request, f'Error al eliminar el ajuste: {str(e)}')
+    except Exception:
+        logger.exception('Error al eliminar el ajuste')
+        messages.error(request, 'Error al eliminar el ajuste. Intente nuevamente.')
 
     # 4. --- Redirigir de vuelta al detalle ---
     return redirect('detalle_casos_coordinador_tecnico_pedagogico', solicitud_id=solicitud_id)
 
-@require_POST
-@login_required
-def enviar_a_coordinador_tecnico_pedagogico(request, solicitud_id):
-    """
-    Vista para que el Encargado de Inclusión envíe el caso al Coordinador Técnico Pedagógico.
-    Cambia el estado del caso de 'pendiente_formulacion_caso' a 'pendiente_formulacion_ajustes'.
-    """
-    # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADORA:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
-
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # 3. --- Verificar que el caso está en el estado correcto ---
-    if solicitud.estado != 'pendiente_formulacion_caso':
-        messages.error(request, 'Este caso no está en estado de formulación del caso. Solo se pueden enviar casos después de formular el caso.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-    
-    try:
-        # 4. --- Cambiar el estado del caso ---
-        solicitud.estado = 'pendiente_formulacion_ajustes'
-        # Nota: No asignamos coordinador_tecnico_pedagogico_asignado aquí porque cualquier Coordinador Técnico Pedagógico
-        # puede trabajar en casos pendientes. Se asignará automáticamente cuando formulen el primer ajuste.
-        solicitud.save()
-        
-        messages.success(request, 'Caso enviado al Coordinador Técnico Pedagógico exitosamente. El caso ahora está pendiente de formulación de ajustes.')
-        
-    except Exception as e:
-        logger.error(f"Error al enviar caso a asesora técnica: {str(e)}")
-        messages.error(request, f'Error al enviar el caso: {str(e)}')
-    
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
+# --- TRANSICIONES DE ESTADO DE LAS SOLICITUDES ---
+# Cada transición define el rol que puede ejecutarla, el estado de origen y destino,
+# la vista de detalle a la que se redirige y los mensajes para el usuario.
+TRANSICIONES_SOLICITUD = {
+    # Encargado de Inclusión -> Coordinador Técnico Pedagógico.
+    # No se asigna coordinador_tecnico_pedagogico_asignado aquí porque cualquier Coordinador Técnico Pedagógico
+    # puede trabajar en casos pendientes. Se asigna automáticamente cuando formulan el primer ajuste.
+    'enviar_a_coordinador_tecnico_pedagogico': {
+        'rol': ROL_COORDINADORA,
+        'estado_origen': 'pendiente_formulacion_caso',
+        'estado_destino': 'pendiente_formulacion_ajustes',
+        'redirect': 'detalle_casos_encargado_inclusion',
+        'mensaje_estado_invalido': 'Este caso no está en estado de formulación del caso. Solo se pueden enviar casos después de formular el caso.',
+        'mensaje_exito': 'Caso enviado al Coordinador Técnico Pedagógico exitosamente. El caso ahora está pendiente de formulación de ajustes.',
+        'mensaje_error': 'Error al enviar el caso',
+    },
+    # Coordinador Técnico Pedagógico -> Asesor Pedagógico (requiere al menos un ajuste formulado)
+    'enviar_a_asesor_pedagogico': {
+        'rol': ROL_COORDINADOR_TECNICO_PEDAGOGICO,
+        'estado_origen': 'pendiente_formulacion_ajustes',
+        'estado_destino': 'pendiente_preaprobacion',
+        'redirect': 'detalle_casos_coordinador_tecnico_pedagogico',
+        'requiere_ajustes': True,
+        'mensaje_estado_invalido': 'Este caso no está en estado de formulación de ajustes.',
+        'mensaje_exito': 'Caso enviado al Asesor Pedagógico exitosamente. El caso ahora está pendiente de preaprobación.',
+        'mensaje_error': 'Error al enviar el caso',
+    },
+    # Coordinador Técnico Pedagógico -> Encargado de Inclusión
+    'devolver_a_encargado_inclusion': {
+        'rol': ROL_COORDINADOR_TECNICO_PEDAGOGICO,
+        'estado_origen': 'pendiente_formulacion_ajustes',
+        'estado_destino': 'pendiente_formulacion_caso',
+        'redirect': 'detalle_casos_coordinador_tecnico_pedagogico',
+        'mensaje_estado_invalido': 'Este caso no está en estado de formulación de ajustes. Solo se pueden devolver casos pendientes de formulación de ajustes.',
+        'mensaje_exito': 'Caso devuelto al Encargado de Inclusión exitosamente. El caso ahora está pendiente de formulación del caso.',
+        'mensaje_error': 'Error al devolver el caso',
+    },
+    # Asesor Pedagógico -> Director
+    'enviar_a_director': {
+        'rol': ROL_ASESOR,
+        'estado_origen': 'pendiente_preaprobacion',
+        'estado_destino': 'pendiente_aprobacion',
+        'redirect': 'detalle_casos_encargado_inclusion',
+        'mensaje_estado_invalido': 'Este caso no está en estado de preaprobación. Solo se pueden enviar casos pendientes de preaprobación.',
+        'mensaje_exito': 'Caso enviado al Director exitosamente. El caso ahora está pendiente de aprobación.',
+        'mensaje_error': 'Error al enviar el caso',
+    },
+    # Asesor Pedagógico -> Coordinador Técnico Pedagógico
+    'devolver_a_coordinador_tecnico_pedagogico': {
+        'rol': ROL_ASESOR,
+        'estado_origen': 'pendiente_preaprobacion',
+        'estado_destino': 'pendiente_formulacion_ajustes',
+        'redirect': 'detalle_casos_encargado_inclusion',
+        'mensaje_estado_invalido': 'Este caso no está en estado de preaprobación. Solo se pueden devolver casos pendientes de preaprobación.',
+        'mensaje_exito': 'Caso devuelto al Asesor Técnico Pedagógico exitosamente. El caso ahora está pendiente de formulación de ajustes.',
+        'mensaje_error': 'Error al devolver el caso',
+    },
+    # Director: aprueba el caso
+    'aprobar_caso': {
+        'rol': ROL_DIRECTOR,
+        'estado_origen': 'pendiente_aprobacion',
+        'estado_destino': 'aprobado',
+        'redirect': 'detalle_casos_encargado_inclusion',
+        'mensaje_estado_invalido': 'Este caso no está en estado de aprobación. Solo se pueden aprobar casos pendientes de aprobación.',
+        'mensaje_exito': 'Caso aprobado exitosamente. El caso ha sido aprobado e informado.',
+        'mensaje_error': 'Error al aprobar el caso',
+    },
+    # Director: rechaza el caso (vuelve a Asesoría Pedagógica para evaluación de corrección)
+    'rechazar_caso': {
+        'rol': ROL_DIRECTOR,
+        'estado_origen': 'pendiente_aprobacion',
+        'estado_destino': 'pendiente_preaprobacion',
+        'redirect': 'detalle_casos_encargado_inclusion',
+        'nivel_mensaje': messages.WARNING,
+        'mensaje_estado_invalido': 'Este caso no está en estado de aprobación. Solo se pueden rechazar casos pendientes de aprobación.',
+        'mensaje_exito': 'Caso rechazado. El caso ha sido devuelto a Asesoría Pedagógica para evaluación de corrección o archivo.',
+        'mensaje_error': 'Error al rechazar el caso',
+    },
+    # Director: desactiva un caso aprobado y lo envía a revisión por Asesoría Pedagógica
+    'desactivar_caso': {
+        'rol': ROL_DIRECTOR,
+        'estado_origen': 'aprobado',
+        'estado_destino': 'pendiente_preaprobacion',
+        'redirect': 'detalle_casos_encargado_inclusion',
+        'nivel_mensaje': messages.WARNING,
+        'mensaje_estado_invalido': 'Solo se pueden desactivar casos que estén aprobados.',
+        'mensaje_exito': 'Caso desactivado. El caso ha sido enviado a revisión por Asesoría Pedagógica.',
+        'mensaje_error': 'Error al desactivar el caso',
+    },
+}
 
 @require_POST
 @login_required
-def enviar_a_asesor_pedagogico(request, solicitud_id):
+def transicion_solicitud(request, solicitud_id, clave):
     """
-    Vista para que el Coordinador Técnico Pedagógico envíe el caso al siguiente estado
-    (pendiente_preaprobacion) después de formular los ajustes.
+    Vista única para las transiciones de estado de una solicitud.
+    La transición a ejecutar se indica con `clave` (ver TRANSICIONES_SOLICITUD),
+    que se fija en cada ruta de urls.py.
     """
-    # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # Verificar que el caso está en el estado correcto
-    if solicitud.estado != 'pendiente_formulacion_ajustes':
-        messages.error(request, 'Este caso no está en estado de formulación de ajustes.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-
-    # 3. --- Verificar que hay ajustes asignados ---
-    ajustes_count = AjusteAsignado.objects.filter(solicitudes=solicitud).count()
-    if ajustes_count == 0:
-        messages.error(request, 'Debe formular al menos un ajuste antes de enviar el caso al Asesor Pedagógico.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-
-    try:
-        # 4. --- Cambiar el estado del caso ---
-        solicitud.estado = 'pendiente_preaprobacion'
-        solicitud.save()
-        
-        messages.success(request, 'Caso enviado al Asesor Pedagógico exitosamente. El caso ahora está pendiente de preaprobación.')
-        
-    except Exception as e:
-        logger.error(f"Error al enviar caso a asesor pedagógico: {str(e)}")
-        messages.error(request, f'Error al enviar el caso: {str(e)}')
-
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_coordinador_tecnico_pedagogico', solicitud_id=solicitud_id)
+    transicion = TRANSICIONES_SOLICITUD.get(clave)
+    if transicion is None:
+        raise Http404('Transición no válida.')
 
-@require_POST
-@login_required
-def devolver_a_encargado_inclusion(request, solicitud_id):
-    """
-    Vista para que el Coordinador Técnico Pedagógico devuelva el caso al Encargado de Inclusión.
-    Cambia el estado del caso de 'pendiente_formulacion_ajustes' a 'pendiente_formulacion_caso'.
-    """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, transicion['rol'])
+    if respuesta is not None:
+        return respuesta
 
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # 3. --- Verificar que el caso está en el estado correcto ---
-    if solicitud.estado != 'pendiente_formulacion_ajustes':
-        messages.error(request, 'Este caso no está en estado de formulación de ajustes. Solo se pueden devolver casos pendientes de formulación de ajustes.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-    
-    try:
-        # 4. --- Cambiar el estado del caso ---
-        solicitud.estado = 'pendiente_formulacion_caso'
-        solicitud.save()
-        
-        messages.success(request, 'Caso devuelto al Encargado de Inclusión exitosamente. El caso ahora está pendiente de formulación del caso.')
-        
-    except Exception as e:
-        logger.error(f"Error al devolver caso a coordinadora: {str(e)}")
-        messages.error(request, f'Error al devolver el caso: {str(e)}')
-    
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_coordinador_tecnico_pedagogico', solicitud_id=solicitud_id)
+    # 2. --- Cambiar el estado del caso ---
+    # Un único UPDATE condicionado al estado de origen: evita el SELECT previo y
+    # que dos envíos simultáneos apliquen la misma transición.
+    solicitudes = Solicitudes.objects.filter(id=solicitud_id, estado=transicion['estado_origen'])
+    if transicion.get('requiere_ajustes'):
+        solicitudes = solicitudes.filter(Exists(AjusteAsignado.objects.filter(solicitudes=OuterRef('pk'))))
 
-@require_POST
-@login_required
-def enviar_a_director(request, solicitud_id):
-    """
-    Vista para que el Asesor Pedagógico envíe el caso al Director.
-    Cambia el estado del caso de 'pendiente_preaprobacion' a 'pendiente_aprobacion'.
-    """
-    # 1. --- Verificación de Permisos ---
     try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_ASESOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
-
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # 3. --- Verificar que el caso está en el estado correcto ---
-    if solicitud.estado != 'pendiente_preaprobacion':
-        messages.error(request, 'Este caso no está en estado de preaprobación. Solo se pueden enviar casos pendientes de preaprobación.')
+        # update() no actualiza los campos auto_now, por eso se asigna updated_at explícitamente
+        actualizadas = solicitudes.update(estado=transicion['estado_destino'], updated_at=timezone.now())
+    except DatabaseError:
+        logger.exception('%s (%s)', transicion['mensaje_error'], clave)
+        messages.error(request, f"{transicion['mensaje_error']}. Intente nuevamente.")
+        return redirect(transicion['redirect'], solicitud_id=solicitud_id)
+
+    # 3. --- Si no se actualizó, informar el motivo (no existe, estado incorrecto o sin ajustes) ---
+    if not actualizadas:
+        # Solo se necesita el estado actual para construir el mensaje
+        estado_actual = Solicitudes.objects.filter(id=solicitud_id).values_list('estado', flat=True).first()
+        if estado_actual is None:
+            raise Http404('No existe la solicitud.')
+        if estado_actual != transicion['estado_origen']:
+            messages.error(request, transicion['mensaje_estado_invalido'])
+        elif transicion.get('requiere_ajustes'):
+            messages.error(request, 'Debe formular al menos un ajuste antes de enviar el caso al Asesor Pedagógico.')
+        else:
+            messages.error(request, f"{transicion['mensaje_error']}. Intente nuevamente.")
         return redirect('detalle_caso', solicitud_id=solicitud_id)
-    
-    try:
-        # 4. --- Cambiar el estado del caso ---
-        solicitud.estado = 'pendiente_aprobacion'
-        solicitud.save()
-        
-        messages.success(request, 'Caso enviado al Director exitosamente. El caso ahora está pendiente de aprobación.')
-        
-    except Exception as e:
-        logger.error(f"Error al enviar caso a director: {str(e)}")
-        messages.error(request, f'Error al enviar el caso: {str(e)}')
-    
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
 
-@require_POST
-@login_required
-def devolver_a_coordinador_tecnico_pedagogico(request, solicitud_id):
-    """
-    Vista para que el Asesor Pedagógico devuelva el caso al Asesor Técnico Pedagógico.
-    Cambia el estado del caso de 'pendiente_preaprobacion' a 'pendiente_formulacion_ajustes'.
-    """
-    # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_ASESOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    # update() no emite post_save: se invalidan a mano los KPIs de los dashboards
+    invalidar_kpis_dashboard()
 
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # 3. --- Verificar que el caso está en el estado correcto ---
-    if solicitud.estado != 'pendiente_preaprobacion':
-        messages.error(request, 'Este caso no está en estado de preaprobación. Solo se pueden devolver casos pendientes de preaprobación.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-    
-    try:
-        # 4. --- Cambiar el estado del caso ---
-        solicitud.estado = 'pendiente_formulacion_ajustes'
-        solicitud.save()
-        
-        messages.success(request, 'Caso devuelto al Asesor Técnico Pedagógico exitosamente. El caso ahora está pendiente de formulación de ajustes.')
-        
-    except Exception as e:
-        logger.error(f"Error al devolver caso a asesor técnico: {str(e)}")
-        messages.error(request, f'Error al devolver el caso: {str(e)}')
-    
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
+    messages.add_message(request, transicion.get('nivel_mensaje', messages.SUCCESS), transicion['mensaje_exito'])
+
+    # 4. --- Redirigir de vuelta al detalle ---
+    return redirect(transicion['redirect'], solicitud_id=solicitud_id)
 
 @require_POST
 @login_required
@@ -2735,18 +2741,18 @@ def editar_ajuste_asesor(request, ajuste_asignado_id):
     cuando el caso está en estado 'pendiente_preaprobacion'.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_ASESOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, ROL_ASESOR)
+    if respuesta is not None:
+        return respuesta
 
     # 2. --- Obtener el Ajuste Asignado ---
-    ajuste_asignado = get_object_or_404(AjusteAsignado, id=ajuste_asignado_id)
+    # Solo se necesitan el estado del caso y el ajuste razonable a modificar
+    ajuste_asignado = get_object_or_404(
+        AjusteAsignado.objects.select_related('ajuste_razonable', 'solicitudes').only(
+            'id', 'solicitudes__id', 'solicitudes__estado', 'ajuste_razonable__id'
+        ),
+        id=ajuste_asignado_id
+    )
     solicitud = ajuste_asignado.solicitudes
     
     # Verificar que el caso está en el estado correcto
@@ -2785,9 +2791,7 @@ def editar_ajuste_asesor(request, ajuste_asignado_id):
             if not nueva_categoria:
                 messages.error(request, 'Debe proporcionar el nombre de la nueva categoría.')
                 return redirect('detalle_caso', solicitud_id=solicitud.id)
-            categoria, created = CategoriasAjustes.objects.get_or_create(
-                nombre_categoria=nueva_categoria.strip().capitalize()
-            )
+            categoria, created = obtener_o_crear_categoria(nueva_categoria.strip().capitalize())
             if created:
                 messages.info(request, f'Categoría "{categoria.nombre_categoria}" creada exitosamente.')
         else:
@@ -2800,13 +2804,13 @@ def editar_ajuste_asesor(request, ajuste_asignado_id):
         ajuste_razonable = ajuste_asignado.ajuste_razonable
         ajuste_razonable.descripcion = descripcion
         ajuste_razonable.categorias_ajustes = categoria
-        ajuste_razonable.save()
+        ajuste_razonable.save(update_fields=['descripcion', 'categorias_ajustes', 'updated_at'])
 
         messages.success(request, 'Ajuste actualizado exitosamente.')
 
-    except Exception as e:
-        logger.error(f"Error al editar ajuste: {str(e)}")
-        messages.error(request, f'Error al editar el ajuste: {str(e)}')
+    except Exception:
+        logger.exception('Error al editar el ajuste')
+        messages.error(request, 'Error al editar el ajuste. Intente nuevamente.')
 
     # 7. --- Redirigir de vuelta al detalle ---
     return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud.id)
@@ -2819,18 +2823,18 @@ def eliminar_ajuste_asesor(request, ajuste_asignado_id):
     cuando el caso está en estado 'pendiente_preaprobacion'.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_ASESOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, ROL_ASESOR)
+    if respuesta is not None:
+        return respuesta
 
     # 2. --- Obtener el Ajuste Asignado ---
-    ajuste_asignado = get_object_or_404(AjusteAsignado, id=ajuste_asignado_id)
+    # Solo se necesitan el estado del caso y el id del ajuste razonable
+    ajuste_asignado = get_object_or_404(
+        AjusteAsignado.objects.select_related('solicitudes').only(
+            'id', 'ajuste_razonable', 'solicitudes__id', 'solicitudes__estado'
+        ),
+        id=ajuste_asignado_id
+    )
     solicitud = ajuste_asignado.solicitudes
     
     # Verificar que el caso está en el estado correcto
@@ -2840,144 +2844,18 @@ def eliminar_ajuste_asesor(request, ajuste_asignado_id):
 
     try:
         # 3. --- Eliminar el Ajuste Asignado y el Ajuste Razonable asociado ---
-        ajuste_razonable = ajuste_asignado.ajuste_razonable
         solicitud_id = solicitud.id
-        ajuste_asignado.delete()
-        # También eliminamos el ajuste razonable si no está siendo usado por otros ajustes asignados
-        if not AjusteAsignado.objects.filter(ajuste_razonable=ajuste_razonable).exists():
-            ajuste_razonable.delete()
+        _eliminar_ajuste_asignado(ajuste_asignado)
         
         messages.success(request, 'Ajuste eliminado exitosamente.')
 
-    except Exception as e:
-        logger.error(f"Error al eliminar ajuste: {str(e)}")
-        messages.error(request, f'Error al eliminar el ajuste: {str(e)}')
+    except Exception:
+        logger.exception('Error al eliminar el ajuste')
+        messages.error(request, 'Error al eliminar el ajuste. Intente nuevamente.')
 
     # 4. --- Redirigir de vuelta al detalle ---
     return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
 
-@require_POST
-@login_required
-def aprobar_caso(request, solicitud_id):
-    """
-    Vista para que el Director apruebe el caso.
-    Cambia el estado del caso de 'pendiente_aprobacion' a 'aprobado'.
-    """
-    # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
-
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # 3. --- Verificar que el caso está en el estado correcto ---
-    if solicitud.estado != 'pendiente_aprobacion':
-        messages.error(request, 'Este caso no está en estado de aprobación. Solo se pueden aprobar casos pendientes de aprobación.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-    
-    try:
-        # 4. --- Cambiar el estado del caso ---
-        solicitud.estado = 'aprobado'
-        solicitud.save()
-        
-        messages.success(request, 'Caso aprobado exitosamente. El caso ha sido aprobado e informado.')
-        
-    except Exception as e:
-        logger.error(f"Error al aprobar caso: {str(e)}")
-        messages.error(request, f'Error al aprobar el caso: {str(e)}')
-    
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
-
-@require_POST
-@login_required
-def rechazar_caso(request, solicitud_id):
-    """
-    Vista para que el Director rechace el caso.
-    Cambia el estado del caso de 'pendiente_aprobacion' a 'pendiente_preaprobacion' 
-    (vuelve a Asesoría Pedagógica para evaluación de corrección).
-    """
-    # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
-
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # 3. --- Verificar que el caso está en el estado correcto ---
-    if solicitud.estado != 'pendiente_aprobacion':
-        messages.error(request, 'Este caso no está en estado de aprobación. Solo se pueden rechazar casos pendientes de aprobación.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-    
-    try:
-        # 4. --- Cambiar el estado del caso (vuelve a Asesoría Pedagógica) ---
-        solicitud.estado = 'pendiente_preaprobacion'
-        solicitud.save()
-        
-        messages.warning(request, 'Caso rechazado. El caso ha sido devuelto a Asesoría Pedagógica para evaluación de corrección o archivo.')
-        
-    except Exception as e:
-        logger.error(f"Error al rechazar caso: {str(e)}")
-        messages.error(request, f'Error al rechazar el caso: {str(e)}')
-    
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
-
-@require_POST
-@login_required
-def desactivar_caso(request, solicitud_id):
-    """
-    Vista para que el Director desactive un caso aprobado y lo envíe a revisión.
-    Cambia el estado del caso de 'aprobado' a 'pendiente_preaprobacion'.
-    Esto permite que un caso ya aprobado sea reevaluado por el equipo.
-    """
-    # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
-
-    # 2. --- Obtener la Solicitud ---
-    solicitud = get_object_or_404(Solicitudes, id=solicitud_id)
-    
-    # 3. --- Verificar que el caso está en estado aprobado ---
-    if solicitud.estado != 'aprobado':
-        messages.error(request, 'Solo se pueden desactivar casos que estén aprobados.')
-        return redirect('detalle_caso', solicitud_id=solicitud_id)
-    
-    try:
-        # 4. --- Cambiar el estado del caso (vuelve a Asesoría Pedagógica para revisión) ---
-        solicitud.estado = 'pendiente_preaprobacion'
-        solicitud.save()
-        
-        messages.warning(request, 'Caso desactivado. El caso ha sido enviado a revisión por Asesoría Pedagógica.')
-        
-    except Exception as e:
-        logger.error(f"Error al desactivar caso: {str(e)}")
-        messages.error(request, f'Error al desactivar el caso: {str(e)}')
-    
-    # 5. --- Redirigir de vuelta al detalle ---
-    return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud_id)
-
 @require_POST
 @login_required
 def aprobar_ajuste_director(request, ajuste_asignado_id):
@@ -2986,15 +2864,10 @@ def aprobar_ajuste_director(request, ajuste_asignado_id):
     Cambia el estado del ajuste de 'pendiente' a 'aprobado'.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, ROL_DIRECTOR)
+    if respuesta is not None:
+        return respuesta
+    perfil = getattr(request.user, 'perfil', None)
 
     # 2. --- Obtener el Ajuste Asignado ---
     ajuste_asignado = get_object_or_404(AjusteAsignado, id=ajuste_asignado_id)
@@ -3019,9 +2892,9 @@ def aprobar_ajuste_director(request, ajuste_asignado_id):
         
         messages.success(request, f'Ajuste aprobado exitosamente: {ajuste_asignado.ajuste_razonable.descripcion[:50]}...')
         
-    except Exception as e:
-        logger.error(f"Error al aprobar ajuste: {str(e)}")
-        messages.error(request, f'Error al aprobar el ajuste: {str(e)}')
+    except Exception:
+        logger.exception('Error al aprobar el ajuste')
+        messages.error(request, 'Error al aprobar el ajuste. Intente nuevamente.')
     
     # 6. --- Redirigir de vuelta al detalle ---
     return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud.id)
@@ -3034,15 +2907,10 @@ def rechazar_ajuste_director(request, ajuste_asignado_id):
     Cambia el estado del ajuste de 'pendiente' a 'rechazado'.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
-        perfil = None
+    respuesta = verificar_rol(request, ROL_DIRECTOR)
+    if respuesta is not None:
+        return respuesta
+    perfil = getattr(request.user, 'perfil', None)
 
     # 2. --- Obtener el Ajuste Asignado ---
     ajuste_asignado = get_object_or_404(AjusteAsignado, id=ajuste_asignado_id)
@@ -3070,9 +2938,9 @@ def rechazar_ajuste_director(request, ajuste_asignado_id):
         
         messages.warning(request, f'Ajuste rechazado: {ajuste_asignado.ajuste_razonable.descripcion[:50]}...')
         
-    except Exception as e:
-        logger.error(f"Error al rechazar ajuste: {str(e)}")
-        messages.error(request, f'Error al rechazar el ajuste: {str(e)}')
+    except Exception:
+        logger.exception('Error al rechazar el ajuste')
+        messages.error(request, 'Error al rechazar el ajuste. Intente nuevamente.')
     
     # 6. --- Redirigir de vuelta al detalle ---
     return redirect('detalle_casos_encargado_inclusion', solicitud_id=solicitud.id)
@@ -3107,7 +2975,7 @@ def actualizar_descripcion_caso(request, solicitud_id):
     
     if nueva_descripcion is not None:
         solicitud.descripcion = nueva_descripcion
-        solicitud.save()
+        solicitud.save(update_fields=['descripcion', 'updated_at'])
         messages.success(request, 'Descripción del caso actualizada correctamente.')
     else:
         messages.error(request, 'No se recibió la descripción.')
@@ -3131,25 +2999,23 @@ def panel_control_encargado_inclusion(request):
     Panel de control para el Encargado de Inclusión.
     Muestra citas (hoy, semana), calendario interactivo y acciones de cita.
     """
-    try:
-        if request.user.perfil.rol.nombre_rol != ROL_COORDINADORA:
-            messages.error(request, 'No tienes permisos para acceder a este panel.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_COORDINADORA,
+        mensaje='No tienes permisos para acceder a este panel.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
     
     perfil_coordinadora = request.user.perfil
     
     # 1. --- Definición de Fechas ---
     now = timezone.localtime(timezone.now())
     today = now.date()
-    start_of_today = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-    end_of_today = timezone.make_aware(datetime.combine(today, datetime.max.time()))
+    start_of_today, end_of_today = _limites_dia(today, now.tzinfo)
     
-    start_of_week = today - timedelta(days=today.weekday()) # Lunes
-    end_of_week = start_of_week + timedelta(days=6) # Domingo
-    start_of_week_dt = timezone.make_aware(datetime.combine(start_of_week, datetime.min.time()))
-    end_of_week_dt = timezone.make_aware(datetime.combine(end_of_week, datetime.max.time()))
+    # Semana de Lunes a Domingo
+    start_of_week_dt, end_of_week_dt = _limites_semana(today, now.tzinfo)
 
     # 2. --- Obtener Citas para Todos los Encargados de Inclusión (Rol Completo) ---
     
@@ -3160,60 +3026,81 @@ def panel_control_encargado_inclusion(request):
     
     # Base de entrevistas para todas las coordinadoras del rol
     # Todas las coordinadoras deben ver todas las entrevistas agendadas del rol
-    todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
+    # (los IDs se evalúan una sola vez y se reutilizan en ambas consultas)
+    coord_ids = obtener_ids_perfiles_rol(ROL_COORDINADORA)
     entrevistas_coordinadora = Entrevistas.objects.filter(
-        coordinadora__in=todas_las_coordinadoras
+        coordinadora_id__in=coord_ids
     ).exclude(coordinadora__isnull=True).select_related('solicitudes', 'solicitudes__estudiantes')
 
+    # Una sola consulta con todas las citas que pueden aparecer en alguna lista:
+    # las de la semana actual y las pendientes que ya pasaron (sin límite de fecha).
+    # Luego se reparten en Python en las cuatro listas del panel.
+    entrevistas_panel = list(entrevistas_coordinadora.filter(
+        Q(fecha_entrevista__range=(start_of_week_dt, end_of_week_dt)) |
+        Q(estado='pendiente', fecha_entrevista__lt=now)
+    ).order_by('fecha_entrevista'))
+
     # A. Citas del Día
-    citas_hoy_list = entrevistas_coordinadora.filter(
-        fecha_entrevista__range=(start_of_today, end_of_today)
-    ).order_by('fecha_entrevista')
+    citas_hoy_list = [
+        e for e in entrevistas_panel
+        if start_of_today <= e.fecha_entrevista <= end_of_today
+    ]
 
     # B. Citas de la Semana (Próximas de esta semana)
-    citas_semana_list = entrevistas_coordinadora.filter(
-        fecha_entrevista__range=(now, end_of_week_dt),
-        estado='pendiente'
-    ).order_by('fecha_entrevista')
+    citas_semana_list = [
+        e for e in entrevistas_panel
+        if e.estado == 'pendiente' and now <= e.fecha_entrevista <= end_of_week_dt
+    ]
 
     # C. Citas Pendientes de Confirmar (para la sección de "asistencia")
-    citas_pendientes_confirmar = entrevistas_coordinadora.filter(
-        estado='pendiente',
-        fecha_entrevista__lt=now # Citas que ya pasaron
-    ).order_by('fecha_entrevista')
+    citas_pendientes_confirmar = [
+        e for e in entrevistas_panel
+        if e.estado == 'pendiente' and e.fecha_entrevista < now # Citas que ya pasaron
+    ]
 
-    # D. Historial de Citas Pasadas (de la semana actual)
-    citas_pasadas_semana = entrevistas_coordinadora.filter(
-        fecha_entrevista__lt=now, # Citas pasadas
-        fecha_entrevista__gte=start_of_week_dt, # Pero dentro de esta semana
-        estado__in=['realizada', 'no_asistio']
-    ).order_by('-fecha_entrevista')
+    # D. Historial de Citas Pasadas (de la semana actual, más recientes primero)
+    citas_pasadas_semana = [
+        e for e in reversed(entrevistas_panel)
+        if e.estado in ('realizada', 'no_asistio') and start_of_week_dt <= e.fecha_entrevista < now
+    ]
     
     # 3. --- Obtener Datos para el Calendario (de TODAS las coordinadoras) ---
-    todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
+    # Solo se necesitan algunos campos por cita: values() evita construir instancias del modelo
     todas_las_entrevistas = Entrevistas.objects.filter(
-        coordinadora__in=todas_las_coordinadoras
-    ).select_related('solicitudes', 'solicitudes__estudiantes', 'coordinadora').order_by('fecha_entrevista')
+        coordinadora_id__in=coord_ids
+    ).annotate(
+        nombre_estudiante=Concat(
+            'solicitudes__estudiantes__nombres', Value(' '), 'solicitudes__estudiantes__apellidos'
+        )
+    ).values(
+        'fecha_entrevista',
+        'estado',
+        'solicitudes__asunto',
+        'nombre_estudiante',
+    ).order_by('fecha_entrevista')
+    estado_display = dict(Entrevistas.ESTADO_ENTREVISTA_CHOICES)
     
     fechas_con_citas = set()
     citas_data = []
     
     for entrevista in todas_las_entrevistas:
-        fecha_str = timezone.localtime(entrevista.fecha_entrevista).strftime('%Y-%m-%d')
-        hora_str = timezone.localtime(entrevista.fecha_entrevista).strftime('%H:%M')
+        fecha_local = timezone.localtime(entrevista['fecha_entrevista'])
+        fecha_str = fecha_local.strftime('%Y-%m-%d')
+        hora_str = fecha_local.strftime('%H:%M')
         fechas_con_citas.add(fecha_str)
         
         citas_data.append({
             'fecha': fecha_str,
             'hora': hora_str,
-            'estudiante': f"{entrevista.solicitudes.estudiantes.nombres} {entrevista.solicitudes.estudiantes.apellidos}",
-            'asunto': entrevista.solicitudes.asunto,
-            'estado': entrevista.get_estado_display(),
-            'estado_key': entrevista.estado,
+            'estudiante': entrevista['nombre_estudiante'],
+            'asunto': entrevista['solicitudes__asunto'],
+            'estado': estado_display.get(entrevista['estado'], entrevista['estado']),
+            'estado_key': entrevista['estado'],
         })
     
-    fechas_citas_json = json.dumps(list(fechas_con_citas))
-    citas_data_json = json.dumps(citas_data)
+    # Serialización compacta (sin espacios): el JSON pasa luego por |escapejs en la plantilla
+    fechas_citas_json = json.dumps(list(fechas_con_citas), separators=(',', ':'))
+    citas_data_json = json.dumps(citas_data, separators=(',', ':'))
     
     # 4. --- Obtener feriados del año actual para el calendario ---
     from datetime import date
@@ -3234,10 +3121,10 @@ def panel_control_encargado_inclusion(request):
                 "nombre": nombre_espanol
             })
     
-    feriados_json = json.dumps(feriados_mes)
+    feriados_json = json.dumps(feriados_mes, separators=(',', ':'))
     
     # 5. --- Datos para Modales ---
-    categorias_ajustes = CategoriasAjustes.objects.all().order_by('nombre_categoria')
+    categorias_ajustes = obtener_categorias_ajustes()
     
     context = {
         'citas_hoy_list': citas_hoy_list,
@@ -3295,8 +3182,9 @@ def confirmar_cita_coordinadora(request, entrevista_id):
         notas_adicionales = request.POST.get('notas_adicionales', '')
         try:
             # Cualquier coordinadora del rol puede confirmar cualquier entrevista del rol
-            todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
-            entrevista = get_object_or_404(Entrevistas, id=entrevista_id, coordinadora__in=todas_las_coordinadoras)
+            entrevista = get_object_or_404(
+                Entrevistas, id=entrevista_id, coordinadora_id__in=obtener_ids_perfiles_rol(ROL_COORDINADORA)
+            )
             
             if accion in ['realizada', 'no_asistio']:
                 entrevista.estado = accion
@@ -3305,21 +3193,26 @@ def confirmar_cita_coordinadora(request, entrevista_id):
                         entrevista.notas += f"\n\n[Confirmación - {timezone.now().strftime('%d/%m/%Y %H:%M')}]: {notas_adicionales}"
                     else:
                         entrevista.notas = f"[Confirmación - {timezone.now().strftime('%d/%m/%Y %H:%M')}]: {notas_adicionales}"
-                entrevista.save()
+                # La cita y el caso se actualizan juntos (o ninguno)
+                with transaction.atomic():
+                    entrevista.save(update_fields=['estado', 'notas', 'updated_at'])
+                    
+                    if accion == 'realizada':
+                        # Cuando la entrevista se marca como realizada, el caso pasa a pendiente_formulacion_caso
+                        solicitud = entrevista.solicitudes
+                        if solicitud.estado == 'pendiente_entrevista':
+                            solicitud.estado = 'pendiente_formulacion_caso'
+                            solicitud.save(update_fields=['estado', 'updated_at'])
                 
                 if accion == 'realizada':
-                    # Cuando la entrevista se marca como realizada, el caso pasa a pendiente_formulacion_caso
-                    solicitud = entrevista.solicitudes
-                    if solicitud.estado == 'pendiente_entrevista':
-                        solicitud.estado = 'pendiente_formulacion_caso'
-                        solicitud.save()
                     messages.success(request, 'Cita marcada como realizada. El caso ahora está pendiente de formulación del caso.')
                 else:
                     messages.info(request, 'Cita marcada como no asistió. Puedes reagendarla.')
             else:
                 messages.error(request, 'Acción no válida.')
-        except Exception as e:
-            messages.error(request, f'Error al confirmar la cita: {str(e)}')
+        except Exception:
+            logger.exception('Error al confirmar la cita')
+            messages.error(request, 'Error al confirmar la cita. Intente nuevamente.')
             
     # 3. Redirigir siempre al panel de control
     return redirect('panel_control_encargado_inclusion')
@@ -3331,23 +3224,23 @@ def gestionar_horarios_bloqueados(request):
     Permite ver, crear y eliminar horarios bloqueados.
     """
     # 1. Verificar Permiso
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADORA:
-            messages.error(request, 'No tienes permisos para acceder a esta página.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_COORDINADORA,
+        mensaje='No tienes permisos para acceder a esta página.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil = request.user.perfil
     
-    # 2. Obtener horarios bloqueados de esta coordinadora
+    # 2. Obtener horarios bloqueados futuros de esta coordinadora
+    # (el índice único de (coordinadora, fecha_hora) cubre el filtro y el orden)
+    now = timezone.localtime(timezone.now())
     horarios_bloqueados = HorarioBloqueado.objects.filter(
-        coordinadora=perfil
+        coordinadora=perfil,
+        fecha_hora__gte=now
     ).order_by('fecha_hora')
     
-    # Filtrar solo horarios futuros o del día actual
-    now = timezone.localtime(timezone.now())
-    horarios_bloqueados = horarios_bloqueados.filter(fecha_hora__gte=now)
-    
     # 3. Si es POST, crear nuevo horario bloqueado
     if request.method == 'POST':
         fecha_str = request.POST.get('fecha_bloqueo')  # Formato: YYYY-MM-DD
@@ -3358,15 +3251,14 @@ def gestionar_horarios_bloqueados(request):
             messages.error(request, 'Debe seleccionar una fecha y un horario.')
         else:
             try:
-                # Parsear fecha y hora por separado
-                fecha_obj = datetime.strptime(fecha_str, '%Y-%m-%d').date()
-                hora_obj = datetime.strptime(hora_str, '%H:%M').time()
+                # Parsear fecha y hora (formato ISO)
+                fecha_obj, hora_obj = _parsear_fecha_hora(fecha_str, hora_str)
                 
-                # Normalizar la hora a hora en punto (minutos y segundos en 0)
-                hora_normalizada = hora_obj.replace(minute=0, second=0, microsecond=0)
-                
-                # Combinar fecha y hora en un datetime aware
-                fecha_hora = timezone.make_aware(datetime.combine(fecha_obj, hora_normalizada))
+                # Construir el datetime aware en hora en punto (minutos y segundos en 0)
+                fecha_hora = datetime(
+                    fecha_obj.year, fecha_obj.month, fecha_obj.day, hora_obj.hour,
+                    tzinfo=timezone.get_current_timezone()
+                )
                 
                 # Verificar que no esté en el pasado
                 if fecha_hora < now:
@@ -3382,26 +3274,24 @@ def gestionar_horarios_bloqueados(request):
                     if tiene_cita:
                         messages.error(request, 'No se puede bloquear un horario que ya tiene una cita programada.')
                     else:
-                        # Verificar que no esté ya bloqueado
-                        ya_bloqueado = HorarioBloqueado.objects.filter(
+                        # Crear el horario bloqueado si no existía. get_or_create inserta
+                        # dentro de su propia transacción y, ante un envío concurrente,
+                        # el unique_together (coordinadora, fecha_hora) hace que relea el existente.
+                        _, creado = HorarioBloqueado.objects.get_or_create(
                             coordinadora=perfil,
-                            fecha_hora=fecha_hora
-                        ).exists()
+                            fecha_hora=fecha_hora,
+                            defaults={'motivo': motivo}
+                        )
                         
-                        if ya_bloqueado:
-                            messages.error(request, 'Este horario ya está bloqueado.')
-                        else:
-                            # Crear el horario bloqueado
-                            HorarioBloqueado.objects.create(
-                                coordinadora=perfil,
-                                fecha_hora=fecha_hora,
-                                motivo=motivo
-                            )
+                        if creado:
                             messages.success(request, 'Horario bloqueado exitosamente.')
-            except ValueError as e:
-                messages.error(request, f'Formato de fecha u hora inválido: {str(e)}')
-            except Exception as e:
-                messages.error(request, f'Error al bloquear el horario: {str(e)}')
+                        else:
+                            messages.error(request, 'Este horario ya está bloqueado.')
+            except ValueError:
+                messages.error(request, 'Formato de fecha u hora inválido.')
+            except Exception:
+                logger.exception('Error al bloquear el horario')
+                messages.error(request, 'Error al bloquear el horario. Intente nuevamente.')
         
         return redirect('gestionar_horarios_bloqueados')
     
@@ -3419,21 +3309,19 @@ def eliminar_horario_bloqueado(request, horario_id):
     Vista para que el Encargado de Inclusión elimine un horario bloqueado.
     """
     # 1. Verificar Permiso
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADORA:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(request, ROL_COORDINADORA, permitir_superusuario=False)
+    if respuesta is not None:
+        return respuesta
+    perfil = request.user.perfil
     
     # 2. Obtener y eliminar el horario bloqueado
     try:
         horario = get_object_or_404(HorarioBloqueado, id=horario_id, coordinadora=perfil)
         horario.delete()
         messages.success(request, 'Horario desbloqueado exitosamente.')
-    except Exception as e:
-        messages.error(request, f'Error al desbloquear el horario: {str(e)}')
+    except Exception:
+        logger.exception('Error al desbloquear el horario')
+        messages.error(request, 'Error al desbloquear el horario. Intente nuevamente.')
     
     return redirect('gestionar_horarios_bloqueados')
 
@@ -3468,14 +3356,19 @@ def editar_notas_cita_coordinadora(request, entrevista_id):
     if request.method == 'POST':
         nuevas_notas = request.POST.get('notas', '')
         try:
-            # Cualquier coordinadora del rol puede editar notas de cualquier entrevista del rol
-            todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
-            entrevista = get_object_or_404(Entrevistas, id=entrevista_id, coordinadora__in=todas_las_coordinadoras)
-            entrevista.notas = nuevas_notas
-            entrevista.save()
-            messages.success(request, 'Notas actualizadas correctamente.')
-        except Exception as e:
-            messages.error(request, f'Error al actualizar las notas: {str(e)}')
+            # Cualquier coordinadora del rol puede editar notas de cualquier entrevista del rol.
+            # Se actualiza directamente en la base de datos, sin cargar la entrevista.
+            actualizadas = Entrevistas.objects.filter(
+                id=entrevista_id,
+                coordinadora__rol__nombre_rol=ROL_COORDINADORA
+            ).update(notas=nuevas_notas, updated_at=timezone.now())
+            if actualizadas:
+                messages.success(request, 'Notas actualizadas correctamente.')
+            else:
+                messages.error(request, 'La cita no existe.')
+        except Exception:
+            logger.exception('Error al actualizar las notas')
+            messages.error(request, 'Error al actualizar las notas. Intente nuevamente.')
             
     # 3. Redirigir
     return redirect('panel_control_encargado_inclusion')
@@ -3490,12 +3383,9 @@ def agendar_cita_coordinadora(request):
     ESTADOS_EDITABLES_ENCARGADO = ['pendiente_entrevista', 'pendiente_formulacion_caso']
     
     # 1. Verificar Permiso
-    try:
-        if request.user.perfil.rol.nombre_rol != ROL_COORDINADORA:
-            messages.error(request, 'No tienes permisos para realizar esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(request, ROL_COORDINADORA, permitir_superusuario=False)
+    if respuesta is not None:
+        return respuesta
 
     # 2. Lógica de la Acción
     if request.method == 'POST':
@@ -3540,33 +3430,20 @@ def agendar_cita_coordinadora(request):
             fecha_str = str(fecha_str)
             hora_str = str(hora_str)
             
-            # Parsear fecha y hora por separado
+            # Parsear fecha y hora (formato ISO)
             try:
-                fecha_obj = datetime.strptime(fecha_str, '%Y-%m-%d').date()
-                hora_obj = datetime.strptime(hora_str, '%H:%M').time()
+                fecha_obj, hora_obj = _parsear_fecha_hora(fecha_str, hora_str)
             except (ValueError, TypeError) as ve:
                 messages.error(request, f'Formato de fecha u hora inválido.')
                 logger.error(f'Error parseando fecha/hora: fecha_str={fecha_str}, hora_str={hora_str}, error={str(ve)}')
                 return redirect('detalle_caso', solicitud_id=solicitud_id)
             
-            # Normalizar la hora a hora en punto (minutos y segundos en 0)
-            hora_normalizada = hora_obj.replace(minute=0, second=0, microsecond=0)
-            
-            # Combinar fecha y hora en un datetime naive primero
-            fecha_hora_naive = datetime.combine(fecha_obj, hora_normalizada)
-            
-            # Verificar que el datetime naive sea válido
-            if not isinstance(fecha_hora_naive, datetime):
-                messages.error(request, 'Error al combinar fecha y hora.')
-                return redirect('detalle_caso', solicitud_id=solicitud_id)
-            
-            # Convertir a datetime aware usando la zona horaria del sistema
-            try:
-                fecha_entrevista = timezone.make_aware(fecha_hora_naive)
-            except (ValueError, TypeError) as e:
-                messages.error(request, f'Error al procesar la fecha y hora seleccionadas.')
-                logger.error(f'Error en make_aware: fecha_hora_naive={fecha_hora_naive}, tipo={type(fecha_hora_naive)}, error={str(e)}')
-                return redirect('detalle_caso', solicitud_id=solicitud_id)
+            # Construir el datetime aware en hora en punto (minutos y segundos en 0)
+            # usando la zona horaria del sistema
+            fecha_entrevista = datetime(
+                fecha_obj.year, fecha_obj.month, fecha_obj.day, hora_obj.hour,
+                tzinfo=timezone.get_current_timezone()
+            )
             
             # Verificar que no esté en el pasado
             now = timezone.localtime(timezone.now())
@@ -3575,59 +3452,56 @@ def agendar_cita_coordinadora(request):
                 return redirect('detalle_caso', solicitud_id=solicitud_id)
             
             # Buscar coordinadora disponible para el horario seleccionado
-            todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
-            coordinadora_asignada = None
+            coord_ids = obtener_ids_perfiles_rol(ROL_COORDINADORA)
             
-            from .models import HorarioBloqueado
-            for coord in todas_las_coordinadoras:
-                tiene_cita = Entrevistas.objects.filter(
-                    coordinadora=coord,
-                    fecha_entrevista=fecha_entrevista
-                ).exists()
-                tiene_horario_bloqueado = HorarioBloqueado.objects.filter(
-                    coordinadora=coord,
-                    fecha_hora=fecha_entrevista
-                ).exists()
-                if not tiene_cita and not tiene_horario_bloqueado:
-                    coordinadora_asignada = coord
-                    break
-            
-            # Si ninguna coordinadora está disponible, usar la primera (fallback)
-            if not coordinadora_asignada:
-                coordinadora_asignada = todas_las_coordinadoras.first()
-            
-            if not coordinadora_asignada:
+            if not coord_ids:
                 messages.error(request, 'No hay coordinadoras disponibles para agendar la cita.')
                 return redirect('detalle_caso', solicitud_id=solicitud_id)
             
-            # Verificar que no haya una cita ya agendada para esta solicitud en este horario
-            cita_existente = Entrevistas.objects.filter(
-                solicitudes=solicitud,
-                fecha_entrevista=fecha_entrevista
-            ).exists()
+            # Coordinadoras ocupadas en ese horario (con cita o con el horario bloqueado), en una sola consulta
+            ocupadas = set(
+                Entrevistas.objects.filter(
+                    coordinadora_id__in=coord_ids,
+                    fecha_entrevista=fecha_entrevista
+                ).values_list('coordinadora_id', flat=True).union(
+                    HorarioBloqueado.objects.filter(
+                        coordinadora_id__in=coord_ids,
+                        fecha_hora=fecha_entrevista
+                    ).values_list('coordinadora_id', flat=True)
+                )
+            )
+            
+            # La primera coordinadora libre; si ninguna está disponible, usar la primera (fallback)
+            coordinadora_asignada_id = next(
+                (coord_id for coord_id in coord_ids if coord_id not in ocupadas),
+                coord_ids[0]
+            )
             
-            if cita_existente:
+            # Crear la nueva entrevista. La restricción única de citas pendientes
+            # (solicitudes, fecha_entrevista) rechaza una segunda cita del caso en ese horario.
+            try:
+                with transaction.atomic():
+                    nueva_entrevista = Entrevistas.objects.create(
+                        solicitudes=solicitud,
+                        coordinadora_id=coordinadora_asignada_id,
+                        fecha_entrevista=fecha_entrevista,
+                        modalidad=modalidad,
+                        notas=notas,
+                        estado='pendiente'
+                    )
+            except IntegrityError:
                 messages.error(request, 'Ya existe una cita agendada para este caso en ese horario.')
                 return redirect('detalle_caso', solicitud_id=solicitud_id)
             
-            # Crear la nueva entrevista
-            nueva_entrevista = Entrevistas.objects.create(
-                solicitudes=solicitud,
-                coordinadora=coordinadora_asignada,
-                fecha_entrevista=fecha_entrevista,
-                modalidad=modalidad,
-                notas=notas,
-                estado='pendiente'
-            )
-            
             # Si el caso está en estado 'pendiente_entrevista', mantenerlo así
             # (no cambiar el estado automáticamente al agendar)
             
             messages.success(request, 'Cita agendada correctamente.')
-        except ValueError as e:
-            messages.error(request, f'Formato de fecha inválido: {str(e)}')
-        except Exception as e:
-            messages.error(request, f'Error al agendar la cita: {str(e)}')
+        except ValueError:
+            messages.error(request, 'Formato de fecha u hora inválido.')
+        except Exception:
+            logger.exception('Error al agendar la cita')
+            messages.error(request, 'Error al agendar la cita. Intente nuevamente.')
     
     # 3. Redirigir al detalle del caso
     solicitud_id = request.POST.get('solicitud_id') if request.method == 'POST' else request.GET.get('solicitud_id')
@@ -3680,8 +3554,11 @@ def reagendar_cita_coordinadora(request, entrevista_id):
             hora_str = hora_str[0].strip() if hora_str else ''
         try:
             # Cualquier coordinadora del rol puede reagendar cualquier entrevista del rol
-            todas_las_coordinadoras = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADORA)
-            entrevista_original = get_object_or_404(Entrevistas, id=entrevista_id, coordinadora__in=todas_las_coordinadoras)
+            entrevista_original = get_object_or_404(
+                Entrevistas.objects.select_related('coordinadora', 'solicitudes'),
+                id=entrevista_id,
+                coordinadora__rol__nombre_rol=ROL_COORDINADORA
+            )
             
             # Validar que fecha_str y hora_str sean strings válidos y no vacíos
             if not fecha_str or not hora_str:
@@ -3692,54 +3569,52 @@ def reagendar_cita_coordinadora(request, entrevista_id):
             fecha_str = str(fecha_str)
             hora_str = str(hora_str)
             
-            # Parsear fecha y hora por separado
+            # Parsear fecha y hora (formato ISO)
             try:
-                fecha_obj = datetime.strptime(fecha_str, '%Y-%m-%d').date()
-                hora_obj = datetime.strptime(hora_str, '%H:%M').time()
+                fecha_obj, hora_obj = _parsear_fecha_hora(fecha_str, hora_str)
             except (ValueError, TypeError) as ve:
                 messages.error(request, f'Formato de fecha u hora inválido.')
                 logger.error(f'Error parseando fecha/hora en reagendar: fecha_str={fecha_str}, hora_str={hora_str}, error={str(ve)}')
                 return redirect('detalle_caso', solicitud_id=entrevista_original.solicitudes.id)
             
-            # Normalizar la hora a hora en punto (minutos y segundos en 0)
-            hora_normalizada = hora_obj.replace(minute=0, second=0, microsecond=0)
-            
-            # Combinar fecha y hora en un datetime naive primero
-            fecha_hora_naive = datetime.combine(fecha_obj, hora_normalizada)
-            
-            # Verificar que el datetime naive sea válido
-            if not isinstance(fecha_hora_naive, datetime):
-                messages.error(request, 'Error al combinar fecha y hora.')
-                return redirect('detalle_caso', solicitud_id=entrevista_original.solicitudes.id)
+            # Construir el datetime aware en hora en punto (minutos y segundos en 0)
+            # usando la zona horaria del sistema
+            nueva_fecha = datetime(
+                fecha_obj.year, fecha_obj.month, fecha_obj.day, hora_obj.hour,
+                tzinfo=timezone.get_current_timezone()
+            )
             
-            # Convertir a datetime aware usando la zona horaria del sistema
+            # Cerrar la original y crear la nueva cita en una sola transacción.
+            # La original se cierra primero: así se puede reagendar sobre su mismo horario
+            # (queda como historial) y la restricción única solo rechaza otra cita
+            # pendiente del caso en el nuevo horario.
             try:
-                nueva_fecha = timezone.make_aware(fecha_hora_naive)
-            except (ValueError, TypeError) as e:
-                messages.error(request, f'Error al procesar la fecha y hora seleccionadas.')
-                logger.error(f'Error en make_aware (reagendar): fecha_hora_naive={fecha_hora_naive}, tipo={type(fecha_hora_naive)}, error={str(e)}')
+                with transaction.atomic():
+                    # Actualizar la cita original a 'no asistió' si estaba 'pendiente'
+                    if entrevista_original.estado == 'pendiente':
+                        entrevista_original.estado = 'no_asistio' 
+                    # Si ya era 'no_asistio', se mantiene así.
+                    entrevista_original.save(update_fields=['estado', 'updated_at'])
+                    
+                    # Mantenemos la misma coordinadora asignada originalmente
+                    nueva_entrevista = Entrevistas.objects.create(
+                        solicitudes=entrevista_original.solicitudes, 
+                        coordinadora=entrevista_original.coordinadora, # Mantiene la coordinadora original
+                        fecha_entrevista=nueva_fecha, 
+                        modalidad=nueva_modalidad or entrevista_original.modalidad,
+                        notas=f"Reagendada desde cita del {entrevista_original.fecha_entrevista.strftime('%d/%m/%Y %H:%M')}. {notas_reagendamiento}" if notas_reagendamiento else f"Reagendada desde cita del {entrevista_original.fecha_entrevista.strftime('%d/%m/%Y %H:%M')}.",
+                        estado='pendiente' # La nueva cita está pendiente
+                    )
+            except IntegrityError:
+                # Restricción única de citas pendientes (solicitudes, fecha_entrevista)
+                messages.error(request, 'Ya existe una cita agendada para este caso en ese horario.')
                 return redirect('detalle_caso', solicitud_id=entrevista_original.solicitudes.id)
             
-            # Crear la nueva cita (mantenemos la misma coordinadora asignada originalmente)
-            nueva_entrevista = Entrevistas.objects.create(
-                solicitudes=entrevista_original.solicitudes, 
-                coordinadora=entrevista_original.coordinadora, # Mantiene la coordinadora original
-                fecha_entrevista=nueva_fecha, 
-                modalidad=nueva_modalidad or entrevista_original.modalidad,
-                notas=f"Reagendada desde cita del {entrevista_original.fecha_entrevista.strftime('%d/%m/%Y %H:%M')}. {notas_reagendamiento}" if notas_reagendamiento else f"Reagendada desde cita del {entrevista_original.fecha_entrevista.strftime('%d/%m/%Y %H:%M')}.",
-                estado='pendiente' # La nueva cita está pendiente
-            )
-            
-            # Actualizar la cita original a 'no asistió' si estaba 'pendiente'
-            if entrevista_original.estado == 'pendiente':
-                entrevista_original.estado = 'no_asistio' 
-            # Si ya era 'no_asistio', se mantiene así.
-            entrevista_original.save()
-            
             messages.success(request, 'Cita reagendada correctamente.')
             return redirect('detalle_caso', solicitud_id=entrevista_original.solicitudes.id)
-        except Exception as e:
-            messages.error(request, f'Error al reagendar la cita: {str(e)}')
+        except Exception:
+            logger.exception('Error al reagendar la cita')
+            messages.error(request, 'Error al reagendar la cita. Intente nuevamente.')
             # Intentar redirigir al caso si es posible, sino al panel
             try:
                 entrevista_original = get_object_or_404(Entrevistas, id=entrevista_id)
@@ -3760,51 +3635,56 @@ def dashboard_asesor(request):
     por ende debe monitorear la información de todos los casos.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_ASESOR:
-            messages.error(request, 'No tienes permisos para acceder a este panel.')
-            return redirect('home')
-    except AttributeError:
-        logger.warning(f"Usuario {request.user.email} sin perfil/rol intentó acceder al dashboard de asesora pedagógica.")
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_ASESOR,
+        mensaje='No tienes permisos para acceder a este panel.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
     
     # 2. --- Configuración de Fechas ---
     now = timezone.localtime(timezone.now())
     today = now.date()
     
     # Cálculo de la semana (Lunes a Domingo)
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
-    start_of_week_dt = timezone.make_aware(datetime.combine(start_of_week, datetime.min.time()))
-    end_of_week_dt = timezone.make_aware(datetime.combine(end_of_week, datetime.max.time()))
+    start_of_week_dt, end_of_week_dt = _limites_semana(today, now.tzinfo)
     
     # 3. --- Obtener Datos para KPIs ---
     
-    # KPI 1: Casos nuevos (creados esta semana)
-    casos_nuevos_semana = Solicitudes.objects.filter(
-        created_at__range=(start_of_week_dt, end_of_week_dt)
-    ).count()
-    
-    # KPI 2: Casos devueltos desde Director de Carrera
-    # Casos que están en 'pendiente_preaprobacion' y que tienen ajustes asignados
-    # (lo que indica que fueron preaprobados y enviados al Director, pero fueron rechazados/devueltos)
-    # Esto es una aproximación: casos con ajustes que están en preaprobación
-    casos_devueltos_director = Solicitudes.objects.filter(
-        estado='pendiente_preaprobacion',
-        ajusteasignado__isnull=False
-    ).distinct().count()
+    # KPI 1 y 2 en una sola consulta (agregación condicional):
+    # - Casos nuevos (creados esta semana)
+    # - Casos devueltos desde Director de Carrera: casos en 'pendiente_preaprobacion' que
+    #   tienen ajustes asignados (lo que indica que fueron preaprobados y enviados al
+    #   Director, pero fueron rechazados/devueltos). Esto es una aproximación.
+    #   Exists() evita el JOIN + DISTINCT: basta con encontrar un ajuste por caso
+    creados_esta_semana = Q(created_at__range=(start_of_week_dt, end_of_week_dt))
+    en_preaprobacion = Q(estado='pendiente_preaprobacion')
+    kpis_solicitudes = Solicitudes.objects.filter(
+        creados_esta_semana | en_preaprobacion
+    ).alias(
+        tiene_ajustes=Exists(AjusteAsignado.objects.filter(solicitudes=OuterRef('pk')))
+    ).aggregate(
+        casos_nuevos_semana=Count('id', filter=creados_esta_semana),
+        casos_devueltos_director=Count('id', filter=en_preaprobacion & Q(tiene_ajustes=True)),
+    )
+    casos_nuevos_semana = kpis_solicitudes['casos_nuevos_semana']
+    casos_devueltos_director = kpis_solicitudes['casos_devueltos_director']
     
     # KPI 3-9: Un KPI por cada estado de los casos
-    # Crear lista de tuplas (estado_valor, estado_nombre, cantidad) para facilitar el acceso en el template
-    estados_con_cantidad = []
-    for estado_valor, estado_nombre in Solicitudes.ESTADO_CHOICES:
-        cantidad = Solicitudes.objects.filter(estado=estado_valor).count()
-        estados_con_cantidad.append({
+    # Un solo GROUP BY por estado; los estados sin casos quedan en 0
+    cantidades_por_estado = dict(
+        Solicitudes.objects.order_by().values_list('estado').annotate(total=Count('id'))
+    )
+    # Crear lista de tuplas (estado_valor, estado_nombre, cantidad) para facilitar el acceso en el template
+    estados_con_cantidad = [
+        {
             'valor': estado_valor,
             'nombre': estado_nombre,
-            'cantidad': cantidad
-        })
+            'cantidad': cantidades_por_estado.get(estado_valor, 0)
+        }
+        for estado_valor, estado_nombre in Solicitudes.ESTADO_CHOICES
+    ]
     
     # 4. --- Obtener Lista de Casos Pendientes de Preaprobación ---
     # Casos que están en estado 'pendiente_preaprobacion' y que requieren revisión por parte de la Asesora Pedagógica
@@ -3813,6 +3693,11 @@ def dashboard_asesor(request):
     ).select_related(
         'estudiantes',
         'estudiantes__carreras'
+    ).only(
+        # Solo las columnas que muestra la tabla del dashboard
+        'id', 'asunto', 'descripcion', 'estado', 'updated_at',
+        'estudiantes__nombres', 'estudiantes__apellidos', 'estudiantes__rut',
+        'estudiantes__carreras__nombre'
     ).order_by('-updated_at')[:10]  # Los más recientes primero, limitar a 10
     
     # 5. --- Preparar Contexto ---
@@ -3836,14 +3721,12 @@ def estadisticas_asesor_pedagogico(request):
     Incluye estadísticas por roles, ajustes, fechas, carreras y rendimiento del sistema.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_ASESOR:
-            messages.error(request, 'No tienes permisos para acceder a esta página.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_ASESOR,
+        mensaje='No tienes permisos para acceder a esta página.'
+    )
+    if respuesta is not None:
+        return respuesta
     
     # 2. --- Obtener Rango de Tiempo Seleccionado ---
     rango_seleccionado = request.GET.get('rango', 'mes')  # mes, semestre, año, historico
@@ -3876,8 +3759,6 @@ def estadisticas_asesor_pedagogico(request):
         rango_nombre = 'Histórico Completo'
     
     # Rango de fechas para análisis
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
     start_of_month = today.replace(day=1)
     start_of_year = today.replace(month=1, day=1)
     
@@ -4134,9 +4015,8 @@ def estadisticas_asesor_pedagogico(request):
     
     tiempo_promedio = round(sum(tiempos_resolucion) / len(tiempos_resolucion), 1) if tiempos_resolucion else 0
     
-    # Casos resueltos esta semana
-    start_of_week_dt = timezone.make_aware(datetime.combine(start_of_week, datetime.min.time()))
-    end_of_week_dt = timezone.make_aware(datetime.combine(end_of_week, datetime.max.time()))
+    # Casos resueltos esta semana (Lunes a Domingo)
+    start_of_week_dt, end_of_week_dt = _limites_semana(today, now.tzinfo)
     
     casos_resueltos_semana = Solicitudes.objects.filter(
         estado__in=['aprobado', 'rechazado'],
@@ -4494,14 +4374,12 @@ def generar_reporte_pdf_asesor(request):
     """
     Genera un reporte PDF con las estadísticas del Asesor Pedagógico según el rango de tiempo seleccionado.
     """
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_ASESOR:
-            messages.error(request, 'No tienes permisos para acceder a esta página.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_ASESOR,
+        mensaje='No tienes permisos para acceder a esta página.'
+    )
+    if respuesta is not None:
+        return respuesta
     
     rango_seleccionado = request.GET.get('rango', 'mes')
     datos = obtener_datos_estadisticas_por_rango(rango_seleccionado)
@@ -4741,6 +4619,13 @@ def generar_reporte_pdf_asesor(request):
     return response
 
 
+# Columnas que usa la hoja "Detalle de Casos" de los reportes Excel
+CAMPOS_DETALLE_CASOS_EXCEL = (
+    'id', 'asunto', 'estado', 'created_at',
+    'estudiantes__nombres', 'estudiantes__apellidos', 'estudiantes__carreras__nombre',
+)
+
+
 @login_required
 def generar_reporte_excel_asesor(request):
     """
@@ -4891,7 +4776,8 @@ def generar_reporte_excel_asesor(request):
     else:
         casos = Solicitudes.objects.all().select_related('estudiantes', 'estudiantes__carreras')[:1000]
     
-    for caso in casos:
+    # Solo las columnas del detalle; iterator() evita guardar los 1000 casos en la caché del queryset
+    for caso in casos.only(*CAMPOS_DETALLE_CASOS_EXCEL).iterator(chunk_size=200):
         estudiante_nombre = f"{caso.estudiantes.nombres} {caso.estudiantes.apellidos}" if caso.estudiantes else "N/A"
         carrera_nombre = caso.estudiantes.carreras.nombre if caso.estudiantes and caso.estudiantes.carreras else "N/A"
         fecha_creacion = timezone.localtime(caso.created_at).strftime('%Y-%m-%d %H:%M:%S') if caso.created_at else "N/A"
@@ -4999,19 +4885,23 @@ def dashboard_director(request):
     Muestra casos pendientes de su aprobación y un historial
     de casos aprobados de sus carreras.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
 
     # 1. Encontrar las carreras que este director gestiona
-    carreras_del_director = Carreras.objects.filter(director=perfil_director)
+    # Se materializan los IDs una sola vez: sirven para la verificación y para los filtros
+    carreras_ids = list(
+        Carreras.objects.filter(director=perfil_director).values_list('id', flat=True)
+    )
     
     # Si no tiene carreras asignadas, mostrar mensaje y retornar lista vacía
-    if not carreras_del_director.exists():
+    if not carreras_ids:
         # Determinar semestre actual para mostrar en los KPIs
         mes_actual = timezone.localtime(timezone.now()).month
         if mes_actual >= 3 and mes_actual <= 8:
@@ -5033,9 +4923,6 @@ def dashboard_director(request):
         }
         return render(request, 'SIAPE/dashboard_director.html', context)
     
-    # Obtener IDs de las carreras para hacer el filtro más eficiente
-    carreras_ids = carreras_del_director.values_list('id', flat=True)
-    
     # 1.5. Determinar el semestre actual basado en la fecha
     # Semestre 1: Marzo - Agosto (meses 3-8)
     # Semestre 2: Septiembre - Febrero (meses 9-12, 1-2)
@@ -5058,24 +4945,33 @@ def dashboard_director(request):
         estudiantes__semestre_actual=semestre_actual
     )
 
+    # Columnas que usan las tablas de pendientes e historial del dashboard
+    CAMPOS_LISTA_DIRECTOR = [
+        'id', 'asunto', 'estado', 'created_at', 'updated_at',
+        'estudiantes__nombres', 'estudiantes__apellidos', 'estudiantes__rut',
+        'estudiantes__carreras__nombre',
+    ]
+
     # 3. Filtrar solicitudes PENDIENTES (estado 'pendiente_aprobacion')
     # Estos son los casos que el Asesor Pedagógico le envió.
-    solicitudes_pendientes = solicitudes_base.filter(
+    # Se evalúa una sola vez como lista: el template la recorre sin volver a consultar
+    solicitudes_pendientes = list(solicitudes_base.filter(
         estado='pendiente_aprobacion'
-    ).order_by('updated_at') # Más antiguas (recién llegadas) primero
+    ).only(*CAMPOS_LISTA_DIRECTOR).order_by('updated_at')) # Más antiguas (recién llegadas) primero
 
     # 4. Filtrar el HISTORIAL (casos 'aprobados' o 'rechazados')
     solicitudes_historial_base = solicitudes_base.filter(
         estado__in=['aprobado', 'rechazado']
-    ).order_by('-updated_at') # Más recientes primero
+    ).only(*CAMPOS_LISTA_DIRECTOR).order_by('-updated_at') # Más recientes primero
 
     # 5. KPIs (Específicos del Director) - filtrar por semestre actual
-    kpis = {
-        'total_pendientes': solicitudes_base_semestre.filter(estado='pendiente_aprobacion').count(),
-        'total_aprobados': solicitudes_base_semestre.filter(estado='aprobado').count(),
-        'total_rechazados': solicitudes_base_semestre.filter(estado='rechazado').count(),
-        'semestre_actual': semestre_actual,
-    }
+    # Los tres conteos salen de una sola consulta con agregación condicional
+    kpis = solicitudes_base_semestre.aggregate(
+        total_pendientes=Count('id', filter=Q(estado='pendiente_aprobacion')),
+        total_aprobados=Count('id', filter=Q(estado='aprobado')),
+        total_rechazados=Count('id', filter=Q(estado='rechazado')),
+    )
+    kpis['semestre_actual'] = semestre_actual
 
     # 6. Paginación del historial (10 por página)
     page_historial = request.GET.get('page_historial', 1)
@@ -5101,26 +4997,28 @@ def carreras_director(request):
     """
     Muestra las carreras asignadas al Director de Carrera logueado.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
 
-    # Buscamos las carreras donde el director sea el usuario actual
-    carreras_list = Carreras.objects.filter(
+    # Buscamos las carreras donde el director sea el usuario actual.
+    # Se evalúa una sola vez: el total sale de la misma lista que recorre el template
+    carreras_list = list(Carreras.objects.filter(
         director=perfil_director
     ).select_related(
         'area'
     ).annotate(
         total_estudiantes=Count('estudiantes') # Contamos los estudiantes via FK
-    ).order_by('nombre')
+    ).order_by('nombre'))
 
     context = {
         'carreras_list': carreras_list,
-        'total_carreras': carreras_list.count()
+        'total_carreras': len(carreras_list)
     }
     return render(request, 'SIAPE/carreras_director.html', context)
 
@@ -5130,21 +5028,24 @@ def estudiantes_por_carrera_director(request, carrera_id):
     Muestra la lista de estudiantes de una carrera específica
     gestionada por el Director de Carrera.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
 
     # 1. Obtener la carrera y verificar que el director sea el correcto
     # Esta es la comprobación de seguridad:
     carrera = get_object_or_404(Carreras, id=carrera_id, director=perfil_director)
 
-    # 2. Obtener los estudiantes de esa carrera
+    # 2. Obtener los estudiantes de esa carrera (solo las columnas del listado)
     estudiantes_list = Estudiantes.objects.filter(
         carreras=carrera
+    ).only(
+        'id', 'nombres', 'apellidos', 'rut', 'email', 'numero'
     ).order_by('apellidos', 'nombres')
 
     context = {
@@ -5162,43 +5063,45 @@ def perfil_estudiante_director(request, estudiante_id):
     Muestra el perfil completo de un estudiante con sus solicitudes
     para el Director de Carrera.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
 
-    # 1. Obtener el estudiante
-    estudiante = get_object_or_404(Estudiantes, id=estudiante_id)
+    # 1. Obtener el estudiante (con su carrera, que se usa en el permiso y en el template)
+    estudiante = get_object_or_404(Estudiantes.objects.select_related('carreras'), id=estudiante_id)
     
     # 2. Verificar que el director tenga acceso a la carrera del estudiante
-    carreras_del_director = Carreras.objects.filter(director=perfil_director)
-    if estudiante.carreras not in carreras_del_director:
+    # (carreras es una FK: basta comparar el director de la carrera ya cargada)
+    if estudiante.carreras is None or estudiante.carreras.director_id != perfil_director.id:
         messages.error(request, 'No tienes permisos para ver este estudiante.')
         return redirect('carreras_director')
     
     # 3. Obtener todas las solicitudes del estudiante ordenadas por fecha (más recientes primero)
+    # Los ajustes se traen en una sola consulta junto con su ajuste razonable y categoría
     solicitudes = Solicitudes.objects.filter(
         estudiantes=estudiante
-    ).select_related(
-        'estudiantes',
-        'estudiantes__carreras',
-        'coordinadora_asignada',
-        'coordinador_tecnico_pedagogico_asignado',
-        'asesor_pedagogico_asignado'
     ).prefetch_related(
-        'ajusteasignado_set',
-        'ajusteasignado_set__ajuste_razonable',
-        'ajusteasignado_set__ajuste_razonable__categorias_ajustes'
+        Prefetch(
+            'ajusteasignado_set',
+            queryset=AjusteAsignado.objects.select_related('ajuste_razonable__categorias_ajustes')
+        )
     ).order_by('-created_at')
     
-    # 4. Estadísticas del estudiante
-    total_solicitudes = solicitudes.count()
-    solicitudes_aprobadas = solicitudes.filter(estado='aprobado').count()
-    solicitudes_rechazadas = solicitudes.filter(estado='rechazado').count()
-    solicitudes_pendientes = solicitudes.exclude(estado__in=['aprobado', 'rechazado']).count()
+    # 4. Estadísticas del estudiante (una sola consulta con agregación condicional)
+    estadisticas = Solicitudes.objects.filter(estudiantes=estudiante).aggregate(
+        total=Count('id'),
+        aprobadas=Count('id', filter=Q(estado='aprobado')),
+        rechazadas=Count('id', filter=Q(estado='rechazado')),
+    )
+    total_solicitudes = estadisticas['total']
+    solicitudes_aprobadas = estadisticas['aprobadas']
+    solicitudes_rechazadas = estadisticas['rechazadas']
+    solicitudes_pendientes = total_solicitudes - solicitudes_aprobadas - solicitudes_rechazadas
     
     # 5. Obtener asignaturas en curso del estudiante
     asignaturas_en_curso = estudiante.asignaturasencurso_set.filter(estado=True).select_related('asignaturas')
@@ -5225,13 +5128,14 @@ def estadisticas_director(request):
     """
     
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
 
     # 2. --- Obtener Rango de Tiempo Seleccionado ---
     rango_seleccionado = request.GET.get('rango', 'mes')  # mes, semestre, año, historico
@@ -5302,10 +5206,6 @@ def estadisticas_director(request):
     # No usar distinct() ya que cada AjusteAsignado es único y no debería haber duplicados
     ajustes_base = AjusteAsignado.objects.filter(
         solicitudes__estudiantes__carreras__id__in=carreras_ids
-    ).select_related(
-        'solicitudes',
-        'solicitudes__estudiantes',
-        'solicitudes__estudiantes__carreras'
     )
     
     # Aplicar filtro de tiempo (si está definido)
@@ -5317,10 +5217,18 @@ def estadisticas_director(request):
     total_casos = solicitudes_base.count()
     casos_aprobados = solicitudes_base.filter(estado='aprobado').count()
     casos_pendientes = solicitudes_base.exclude(estado__in=['aprobado', 'rechazado']).count()
-    total_ajustes = ajustes_base.count()
-    ajustes_aprobados = ajustes_base.filter(estado_aprobacion='aprobado').count()
-    ajustes_rechazados = ajustes_base.filter(estado_aprobacion='rechazado').count()
-    ajustes_pendientes = ajustes_base.filter(estado_aprobacion='pendiente').count()
+    # Los ajustes se leen una sola vez: los KPIs y los tres gráficos de ajustes
+    # se calculan sobre estas filas en lugar de recorrer la tabla en cada uno
+    filas_ajustes = list(ajustes_base.values_list(
+        'estado_aprobacion',
+        'ajuste_razonable__categorias_ajustes__nombre_categoria',
+        'solicitudes__estudiantes_id'
+    ))
+    conteo_estados_ajustes = Counter(estado for estado, _, _ in filas_ajustes)
+    total_ajustes = len(filas_ajustes)
+    ajustes_aprobados = conteo_estados_ajustes['aprobado']
+    ajustes_rechazados = conteo_estados_ajustes['rechazado']
+    ajustes_pendientes = conteo_estados_ajustes['pendiente']
     
     tasa_aprobacion = round((casos_aprobados / total_casos * 100) if total_casos > 0 else 0, 1)
     tasa_aprobacion_ajustes = round((ajustes_aprobados / total_ajustes * 100) if total_ajustes > 0 else 0, 1)
@@ -5333,16 +5241,13 @@ def estadisticas_director(request):
     ).distinct().count()
 
     # 6. --- Gráfico 1: Estado de Ajustes (Doughnut Chart) ---
-    estado_ajustes = ajustes_base.values('estado_aprobacion').annotate(total=Count('id')).order_by('estado_aprobacion')
-    
     pie_labels = []
     pie_data = []
     pie_colors = []
     
-    for d in estado_ajustes:
-        estado = d['estado_aprobacion']
+    for estado in sorted(conteo_estados_ajustes):
         pie_labels.append(estado.capitalize())
-        pie_data.append(d['total'])
+        pie_data.append(conteo_estados_ajustes[estado])
         if estado == 'aprobado':
             pie_colors.append('rgba(40, 167, 69, 0.7)')  # Verde
         elif estado == 'rechazado':
@@ -5360,28 +5265,15 @@ def estadisticas_director(request):
     }
 
     # 7. --- Gráfico 2: Ajustes Aprobados y Rechazados por Categoría ---
-    # Obtener todos los ajustes (aprobados y rechazados) con sus categorías
-    ajustes_por_categoria_qs = ajustes_base.filter(
-        estado_aprobacion__in=['aprobado', 'rechazado']
-    ).select_related(
-        'ajuste_razonable',
-        'ajuste_razonable__categorias_ajustes'
-    )
-    
-    # Convertir a lista para procesar
-    ajustes_por_categoria_lista = list(ajustes_por_categoria_qs)
-    
-    # Procesar: agrupar por categoría y estado
+    # Procesar: agrupar por categoría y estado (solo aprobados y rechazados)
     categorias_estados = {}  # {categoria: {'aprobado': count, 'rechazado': count}}
     
-    for ajuste in ajustes_por_categoria_lista:
-        if ajuste.ajuste_razonable and ajuste.ajuste_razonable.categorias_ajustes:
-            categoria_nombre = ajuste.ajuste_razonable.categorias_ajustes.nombre_categoria
-        else:
+    for estado, categoria_nombre, _ in filas_ajustes:
+        if estado not in ('aprobado', 'rechazado'):
+            continue
+        if categoria_nombre is None:
             categoria_nombre = 'Sin categoría'
         
-        estado = ajuste.estado_aprobacion
-        
         if categoria_nombre not in categorias_estados:
             categorias_estados[categoria_nombre] = {'aprobado': 0, 'rechazado': 0}
         
@@ -5423,23 +5315,15 @@ def estadisticas_director(request):
     }
 
     # 8. --- Gráfico 3: Secciones con Más Ajustes Aprobados ---
-    # Obtener solo ajustes aprobados para las secciones
+    # Solo ajustes aprobados (un estudiante por ajuste) para las secciones
     # Usar asignaturas_en_curso a través del estudiante en lugar del ManyToMany
-    ajustes_aprobados_secciones_qs = ajustes_base.filter(
-        estado_aprobacion='aprobado'
-    ).select_related(
-        'solicitudes',
-        'solicitudes__estudiantes',
-        'solicitudes__estudiantes__carreras'
-    )
-
-    # Convertir a lista para procesar
-    ajustes_aprobados_secciones_lista = list(ajustes_aprobados_secciones_qs)
+    estudiantes_ids = [
+        estudiante_id for estado, _, estudiante_id in filas_ajustes if estado == 'aprobado'
+    ]
 
     # Pre-cargar todas las asignaturas_en_curso relacionadas para optimizar
     from SIAPE.models import AsignaturasEnCurso
 
-    estudiantes_ids = [ajuste.solicitudes.estudiantes_id for ajuste in ajustes_aprobados_secciones_lista]
     asignaturas_en_curso_dict = {}
 
     if estudiantes_ids:
@@ -5458,10 +5342,7 @@ def estadisticas_director(request):
     # Contar ajustes por sección (asignatura + sección)
     secciones_counter = Counter()
 
-    for ajuste in ajustes_aprobados_secciones_lista:
-        solicitud = ajuste.solicitudes
-        estudiante_id = solicitud.estudiantes_id
-        
+    for estudiante_id in estudiantes_ids:
         # Obtener asignaturas a través de asignaturas_en_curso del estudiante
         asignaturas = asignaturas_en_curso_dict.get(estudiante_id, [])
         
@@ -5676,13 +5557,14 @@ def generar_reporte_pdf_director(request):
     """
     Genera un reporte PDF con las estadísticas del Director de Carrera según el rango de tiempo seleccionado.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     rango_seleccionado = request.GET.get('rango', 'mes')
     
@@ -6455,13 +6337,14 @@ def generar_reporte_excel_director(request):
     import openpyxl
     from openpyxl.styles import Font, PatternFill, Alignment
     
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     rango_seleccionado = request.GET.get('rango', 'mes')
     
@@ -6804,7 +6687,8 @@ def generar_reporte_excel_director(request):
     row += 1
     
     casos = solicitudes_base.select_related('estudiantes', 'estudiantes__carreras')[:1000]
-    for caso in casos:
+    # Solo las columnas del detalle; iterator() evita guardar los 1000 casos en la caché del queryset
+    for caso in casos.only(*CAMPOS_DETALLE_CASOS_EXCEL).iterator(chunk_size=200):
         estudiante_nombre = f"{caso.estudiantes.nombres} {caso.estudiantes.apellidos}" if caso.estudiantes else "N/A"
         carrera_nombre = caso.estudiantes.carreras.nombre if caso.estudiantes and caso.estudiantes.carreras else "N/A"
         fecha_creacion = timezone.localtime(caso.created_at).strftime('%Y-%m-%d %H:%M:%S') if caso.created_at else "N/A"
@@ -6861,13 +6745,14 @@ def gestion_asignaturas_director(request):
     Vista para que el Director gestione las asignaturas de sus carreras.
     Permite ver, activar/desactivar y filtrar asignaturas.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     # Desactivar automáticamente asignaturas de semestres vencidos
     asignaturas_desactivadas = desactivar_asignaturas_semestre_vencido()
@@ -6925,13 +6810,14 @@ def toggle_asignatura_estado(request, asignatura_id):
     """
     Activa o desactiva una asignatura.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     carreras_del_director = Carreras.objects.filter(director=perfil_director)
     asignatura = get_object_or_404(Asignaturas, id=asignatura_id, carreras__in=carreras_del_director)
@@ -6952,13 +6838,14 @@ def bulk_toggle_asignaturas(request):
     """
     Activa o desactiva múltiples asignaturas a la vez.
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     accion = request.POST.get('accion')  # 'activar' o 'desactivar'
     asignaturas_ids = request.POST.getlist('asignaturas_ids')
@@ -6999,13 +6886,14 @@ def gestion_carga_masiva_director(request):
     - Asignaciones estudiante-asignatura
     - Asignaciones docente-asignatura
     """
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     # Obtener carreras del director
     carreras_del_director = Carreras.objects.filter(director=perfil_director)
@@ -7157,8 +7045,9 @@ def cargar_estudiantes_excel(request):
                 messages.warning(request, error)
         messages.success(request, msg)
         
-    except Exception as e:
-        messages.error(request, f'Error al procesar el archivo: {str(e)}')
+    except Exception:
+        logger.exception('Error al procesar el archivo')
+        messages.error(request, 'Error al procesar el archivo. Revise el formato del archivo e intente nuevamente.')
     
     return redirect('gestion_carga_masiva_director')
 
@@ -7174,13 +7063,14 @@ def cargar_docentes_excel(request):
     import openpyxl
     from django.db import transaction
     
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     archivo = request.FILES.get('archivo_excel')
     if not archivo:
@@ -7281,8 +7171,9 @@ def cargar_docentes_excel(request):
                 messages.warning(request, error)
         messages.success(request, msg)
         
-    except Exception as e:
-        messages.error(request, f'Error al procesar el archivo: {str(e)}')
+    except Exception:
+        logger.exception('Error al procesar el archivo')
+        messages.error(request, 'Error al procesar el archivo. Revise el formato del archivo e intente nuevamente.')
     
     return redirect('gestion_carga_masiva_director')
 
@@ -7297,13 +7188,14 @@ def cargar_asignaturas_excel(request):
     import openpyxl
     from django.db import transaction
     
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     archivo = request.FILES.get('archivo_excel')
     if not archivo:
@@ -7421,8 +7313,9 @@ def cargar_asignaturas_excel(request):
                 messages.warning(request, error)
         messages.success(request, msg)
         
-    except Exception as e:
-        messages.error(request, f'Error al procesar el archivo: {str(e)}')
+    except Exception:
+        logger.exception('Error al procesar el archivo')
+        messages.error(request, 'Error al procesar el archivo. Revise el formato del archivo e intente nuevamente.')
     
     return redirect('gestion_carga_masiva_director')
 
@@ -7437,13 +7330,14 @@ def cargar_inscripciones_excel(request):
     import openpyxl
     from django.db import transaction
     
-    try:
-        perfil_director = request.user.perfil
-        if perfil_director.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil_director = request.user.perfil
     
     archivo = request.FILES.get('archivo_excel')
     if not archivo:
@@ -7646,8 +7540,9 @@ def cargar_inscripciones_excel(request):
                 messages.warning(request, error)
         messages.success(request, msg)
         
-    except Exception as e:
-        messages.error(request, f'Error al procesar el archivo: {str(e)}')
+    except Exception:
+        logger.exception('Error al procesar el archivo')
+        messages.error(request, 'Error al procesar el archivo. Revise el formato del archivo e intente nuevamente.')
     
     return redirect('gestion_carga_masiva_director')
 
@@ -7661,13 +7556,13 @@ def descargar_plantilla_excel(request, tipo):
     import openpyxl
     from django.http import HttpResponse
     
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_DIRECTOR:
-            messages.error(request, 'No tienes permisos para esta acción.')
-            return redirect('home')
-    except AttributeError:
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_DIRECTOR,
+        mensaje='No tienes permisos para esta acción.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
     
     wb = openpyxl.Workbook()
     ws = wb.active
@@ -7727,84 +7622,79 @@ def dashboard_coordinador_tecnico_pedagogico(request):
     """
     
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para acceder a este panel.')
-            return redirect('home')
-    except AttributeError:
-        logger.warning(f"Usuario {request.user.email} sin perfil/rol intentó acceder al dashboard de asesora técnica.")
-        return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_COORDINADOR_TECNICO_PEDAGOGICO,
+        mensaje='No tienes permisos para acceder a este panel.',
+        permitir_superusuario=False
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil = request.user.perfil
 
     # 2. --- Configuración de Fechas ---
     now = timezone.localtime(timezone.now())
     today = now.date()
     
     # Cálculo de la semana (Lunes a Domingo)
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
-    start_of_week_dt = timezone.make_aware(datetime.combine(start_of_week, datetime.min.time()))
-    end_of_week_dt = timezone.make_aware(datetime.combine(end_of_week, datetime.max.time()))
+    start_of_week_dt, end_of_week_dt = _limites_semana(today, now.tzinfo)
     
     # 3. --- Obtener Datos para KPIs ---
     
-    # Base de solicitudes para todas las asesoras técnicas (filtramos por rol)
-    todas_las_asesoras_tecnicas = PerfilUsuario.objects.filter(rol__nombre_rol=ROL_COORDINADOR_TECNICO_PEDAGOGICO)
-    
-    # KPI 1: Casos nuevos (pendiente_formulacion_ajustes esta semana)
-    # Casos que cambiaron a pendiente_formulacion_ajustes esta semana
-    casos_nuevos_semana = Solicitudes.objects.filter(
-        estado='pendiente_formulacion_ajustes',
-        updated_at__range=(start_of_week_dt, end_of_week_dt)
-    ).select_related('estudiantes', 'estudiantes__carreras').count()
-    
-    # KPI 2: Casos pendientes de formulación de ajustes en total
-    casos_pendientes_formulacion = Solicitudes.objects.filter(
-        estado='pendiente_formulacion_ajustes'
-    ).select_related('estudiantes', 'estudiantes__carreras')
-    kpi_casos_pendientes_total = casos_pendientes_formulacion.count()
-    
-    # KPI 3: Casos devueltos desde Asesora Pedagógica
-    casos_devueltos = Solicitudes.objects.filter(
-        estado='pendiente_formulacion_ajustes',
-        ajusteasignado__isnull=False
-    ).distinct().count()
-    
-    # KPI 4: Total de ajustes formulados por este coordinador
-    casos_asignados = Solicitudes.objects.filter(
-        coordinador_tecnico_pedagogico_asignado=perfil
-    )
-    total_ajustes_formulados = AjusteAsignado.objects.filter(
-        solicitudes__in=casos_asignados
-    ).count()
-    
-    # KPI 5: Ajustes aprobados
-    ajustes_aprobados = AjusteAsignado.objects.filter(
-        solicitudes__in=casos_asignados,
-        estado_aprobacion='aprobado'
-    ).count()
+    # Los KPIs se guardan en caché por coordinador (ver dashboards.py)
+    def calcular_kpis():
+        # KPIs 1, 2, 3 y 6 salen de una sola consulta con agregación condicional:
+        # - Casos nuevos: cambiaron a pendiente_formulacion_ajustes esta semana
+        # - Casos pendientes de formulación de ajustes en total
+        # - Casos devueltos desde Asesora Pedagógica (pendientes que ya tienen algún ajuste;
+        #   Exists() evita el JOIN + DISTINCT: basta con encontrar un ajuste por caso)
+        # - Casos enviados a Asesor Pedagógico esta semana por este coordinador
+        en_formulacion = Q(estado='pendiente_formulacion_ajustes')
+        esta_semana = Q(updated_at__range=(start_of_week_dt, end_of_week_dt))
+        enviados_por_mi = Q(
+            estado='pendiente_preaprobacion',
+            coordinador_tecnico_pedagogico_asignado=perfil
+        )
+        kpis = Solicitudes.objects.filter(
+            en_formulacion | enviados_por_mi
+        ).alias(
+            tiene_ajustes=Exists(AjusteAsignado.objects.filter(solicitudes=OuterRef('pk')))
+        ).aggregate(
+            casos_nuevos_semana=Count('id', filter=en_formulacion & esta_semana),
+            casos_pendientes_total=Count('id', filter=en_formulacion),
+            casos_devueltos=Count('id', filter=en_formulacion & Q(tiene_ajustes=True)),
+            casos_enviados_semana=Count('id', filter=enviados_por_mi & esta_semana),
+        )
+
+        # KPIs 4 y 5: Ajustes formulados por este coordinador y cuántos fueron aprobados
+        kpis |= AjusteAsignado.objects.filter(
+            solicitudes__coordinador_tecnico_pedagogico_asignado=perfil
+        ).aggregate(
+            total_ajustes_formulados=Count('id'),
+            ajustes_aprobados=Count('id', filter=Q(estado_aprobacion='aprobado')),
+        )
+
+        return kpis
     
-    # KPI 6: Casos enviados a Asesor Pedagógico esta semana
-    casos_enviados_semana = Solicitudes.objects.filter(
-        estado='pendiente_preaprobacion',
-        coordinador_tecnico_pedagogico_asignado=perfil,
-        updated_at__range=(start_of_week_dt, end_of_week_dt)
-    ).count()
+    kpis = obtener_kpis_dashboard('coordinador_tecnico_pedagogico', perfil.id, calcular_kpis)
     
     # 4. --- Obtener Lista de Casos Pendientes de Formulación ---
-    casos_pendientes_list = casos_pendientes_formulacion.order_by('-updated_at')[:10]
+    # El template solo usa datos del caso, del estudiante y de su carrera:
+    # se traen en el mismo JOIN y únicamente con esas columnas
+    casos_pendientes_list = Solicitudes.objects.filter(
+        estado='pendiente_formulacion_ajustes'
+    ).select_related(
+        'estudiantes',
+        'estudiantes__carreras'
+    ).only(
+        'id', 'asunto', 'created_at',
+        'estudiantes__nombres', 'estudiantes__apellidos', 'estudiantes__rut',
+        'estudiantes__carreras__nombre'
+    ).order_by('-updated_at')[:10]
     
     # 5. --- Preparar Contexto ---
     context = {
         'nombre_usuario': request.user.first_name,
-        'kpis': {
-            'casos_nuevos_semana': casos_nuevos_semana,
-            'casos_pendientes_total': kpi_casos_pendientes_total,
-            'casos_devueltos': casos_devueltos,
-            'total_ajustes_formulados': total_ajustes_formulados,
-            'ajustes_aprobados': ajustes_aprobados,
-            'casos_enviados_semana': casos_enviados_semana,
-        },
+        'kpis': kpis,
         'casos_pendientes_list': casos_pendientes_list,
     }
     
@@ -7824,14 +7714,12 @@ def gestion_categorias_ajustes(request):
     Permite crear, editar y eliminar categorías.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para acceder a esta página.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_COORDINADOR_TECNICO_PEDAGOGICO,
+        mensaje='No tienes permisos para acceder a esta página.'
+    )
+    if respuesta is not None:
+        return respuesta
     
     # 2. --- Obtener todas las categorías con conteo de uso ---
     categorias = CategoriasAjustes.objects.annotate(
@@ -7845,12 +7733,12 @@ def gestion_categorias_ajustes(request):
         if accion == 'crear':
             nombre = request.POST.get('nombre', '').strip()
             if nombre:
-                # Verificar si ya existe
-                if CategoriasAjustes.objects.filter(nombre_categoria__iexact=nombre).exists():
-                    messages.error(request, f'La categoría "{nombre}" ya existe.')
-                else:
-                    CategoriasAjustes.objects.create(nombre_categoria=nombre.capitalize())
+                # Verificar si ya existe (el índice único también evita duplicados concurrentes)
+                categoria, created = obtener_o_crear_categoria(nombre.capitalize())
+                if created:
                     messages.success(request, f'Categoría "{nombre}" creada exitosamente.')
+                else:
+                    messages.error(request, f'La categoría "{nombre}" ya existe.')
             else:
                 messages.error(request, 'El nombre de la categoría es requerido.')
         
@@ -7861,7 +7749,7 @@ def gestion_categorias_ajustes(request):
                 try:
                     categoria = CategoriasAjustes.objects.get(id=categoria_id)
                     # Verificar si el nuevo nombre ya existe (excepto la misma categoría)
-                    if CategoriasAjustes.objects.filter(nombre_categoria__iexact=nuevo_nombre).exclude(id=categoria_id).exists():
+                    if CategoriasAjustes.objects.filter(nombre_categoria_lower=nuevo_nombre.lower()).exclude(id=categoria_id).exists():
                         messages.error(request, f'La categoría "{nuevo_nombre}" ya existe.')
                     else:
                         categoria.nombre_categoria = nuevo_nombre.capitalize()
@@ -7869,6 +7757,9 @@ def gestion_categorias_ajustes(request):
                         messages.success(request, 'Categoría actualizada exitosamente.')
                 except CategoriasAjustes.DoesNotExist:
                     messages.error(request, 'Categoría no encontrada.')
+                except IntegrityError:
+                    # Otra petición creó el mismo nombre entre la verificación y el guardado
+                    messages.error(request, f'La categoría "{nuevo_nombre}" ya existe.')
             else:
                 messages.error(request, 'Datos incompletos.')
         
@@ -7904,14 +7795,13 @@ def estadisticas_ajustes_coordinador_tecnico(request):
     Vista de estadísticas de ajustes formulados por el Coordinador Técnico Pedagógico.
     """
     # 1. --- Verificación de Permisos ---
-    try:
-        perfil = request.user.perfil
-        if perfil.rol.nombre_rol != ROL_COORDINADOR_TECNICO_PEDAGOGICO:
-            messages.error(request, 'No tienes permisos para acceder a esta página.')
-            return redirect('home')
-    except AttributeError:
-        if not request.user.is_superuser:
-            return redirect('home')
+    respuesta = verificar_rol(
+        request, ROL_COORDINADOR_TECNICO_PEDAGOGICO,
+        mensaje='No tienes permisos para acceder a esta página.'
+    )
+    if respuesta is not None:
+        return respuesta
+    perfil = getattr(request.user, 'perfil', None)
     
     # 2. --- Obtener ajustes formulados por este coordinador ---
     # Aproximación: ajustes en casos asignados a este coordinador
@@ -8529,6 +8419,26 @@ def detalle_ajuste_docente(request, estudiante_id):
 
 
 # ----------- Vistas de los modelos (API) ------------
+class ListaValoresMixin:
+    """
+    Lista los registros con values() en lugar de instanciar modelos y pasar por el
+    serializer. Solo para catálogos cuyo serializer expone campos simples del modelo:
+    campos_lista debe coincidir con los campos del serializer.
+    """
+    campos_lista = ()
+
+    def list(self, request, *args, **kwargs):
+        # created_at e id se incluyen porque la paginación por cursor los usa como posición
+        campos = dict.fromkeys((*self.campos_lista, 'created_at', 'id'))
+        queryset = self.filter_queryset(self.get_queryset()).values(*campos)
+        page = self.paginate_queryset(queryset)
+        filas = page if page is not None else queryset
+        data = [{campo: fila[campo] for campo in self.campos_lista} for fila in filas]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
 # ViewSets con controles de acceso mejorados
 class UsuarioViewSet(viewsets.ModelViewSet):
     queryset = Usuario.objects.all()
@@ -8545,23 +8455,27 @@ class UsuarioViewSet(viewsets.ModelViewSet):
             return queryset
         # Usuario normal solo ve su propio perfil
         return queryset.filter(id=self.request.user.id)
-class RolesViewSet(viewsets.ModelViewSet):
+class RolesViewSet(ListaValoresMixin, viewsets.ModelViewSet):
     queryset = Roles.objects.all()
     serializer_class = RolesSerializer
     authentication_classes = [SessionAuthentication]
     permission_classes = [IsAdminOrReadOnly]  # Lectura para autenticados, escritura solo admin
-class AreasViewSet(viewsets.ModelViewSet):
+    campos_lista = ('id', 'nombre_rol')
+class AreasViewSet(ListaValoresMixin, viewsets.ModelViewSet):
     queryset = Areas.objects.all()
     serializer_class = AreasSerializer
     authentication_classes = [SessionAuthentication]
     permission_classes = [IsAdminOrReadOnly]  # Lectura para autenticados, escritura solo admin
-class CategoriasAjustesViewSet(viewsets.ModelViewSet):
+    campos_lista = ('id', 'nombre')
+class CategoriasAjustesViewSet(ListaValoresMixin, viewsets.ModelViewSet):
     queryset = CategoriasAjustes.objects.all()
     serializer_class = CategoriasAjustesSerializer
     authentication_classes = [SessionAuthentication]
     permission_classes = [IsAdminOrReadOnly]  # Lectura para autenticados, escritura solo admin
+    campos_lista = ('id', 'nombre_categoria')
 class CarrerasViewSet(viewsets.ModelViewSet):
-    queryset = Carreras.objects.all()
+    # El serializer muestra el director (nombre del usuario) y el área
+    queryset = Carreras.objects.select_related('director__usuario', 'area')
     serializer_class = CarrerasSerializer
     authentication_classes = [SessionAuthentication]
     permission_classes = [IsAdminOrReadOnly]  # Lectura para autenticados, escritura solo admin
@@ -8579,7 +8493,8 @@ class EstudiantesViewSet(viewsets.ModelViewSet):
         - Docente: ve estudiantes de sus asignaturas
         - Otros: acceso limitado
         """
-        queryset = Estudiantes.objects.all()
+        # Se incluye la carrera que muestra el serializer
+        queryset = Estudiantes.objects.select_related('carreras')
         user = self.request.user
         
         if user.is_superuser or user.is_staff:
@@ -8616,7 +8531,13 @@ class SolicitudesViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mixin
         """
         Filtrar solicitudes según el rol del usuario.
         """
-        queryset = Solicitudes.objects.all().order_by('-created_at')
+        # Se incluyen el estudiante y los responsables que muestra el serializer
+        queryset = Solicitudes.objects.select_related(
+            'estudiantes',
+            'coordinadora_asignada__usuario',
+            'coordinador_tecnico_pedagogico_asignado__usuario',
+            'asesor_pedagogico_asignado__usuario'
+        ).order_by('-created_at')
         user = self.request.user
         
         if user.is_superuser or user.is_staff:
@@ -8700,7 +8621,8 @@ class AsignaturasViewSet(viewsets.ModelViewSet):
         """
         Filtrar asignaturas según el rol del usuario.
         """
-        queryset = Asignaturas.objects.all()
+        # Se incluyen la carrera y el docente que muestra el serializer
+        queryset = Asignaturas.objects.select_related('carreras', 'docente__usuario')
         user = self.request.user
         
         if user.is_superuser or user.is_staff:
@@ -8733,7 +8655,8 @@ class AsignaturasEnCursoViewSet(viewsets.ModelViewSet):
         """
         Filtrar asignaturas en curso según el rol del usuario.
         """
-        queryset = AsignaturasEnCurso.objects.all()
+        # Se incluyen el estudiante y la asignatura que muestra el serializer
+        queryset = AsignaturasEnCurso.objects.select_related('estudiantes', 'asignaturas')
         user = self.request.user
         
         if user.is_superuser or user.is_staff:
@@ -8767,7 +8690,8 @@ class EntrevistasViewSet(viewsets.ModelViewSet):
         """
         Filtrar entrevistas según el rol del usuario.
         """
-        queryset = Entrevistas.objects.all()
+        # Se incluyen la solicitud (con su estudiante) y la coordinadora que muestra el serializer
+        queryset = Entrevistas.objects.select_related('solicitudes__estudiantes', 'coordinadora__usuario')
         user = self.request.user
         
         if user.is_superuser or user.is_staff:
@@ -8796,7 +8720,8 @@ class EntrevistasViewSet(viewsets.ModelViewSet):
         except AttributeError:
             return Entrevistas.objects.none()
 class AjusteRazonableViewSet(viewsets.ModelViewSet):
-    queryset = AjusteRazonable.objects.all()
+    # El serializer muestra el nombre de la categoría
+    queryset = AjusteRazonable.objects.select_related('categorias_ajustes')
     serializer_class = AjusteRazonableSerializer
     authentication_classes = [SessionAuthentication]
     permission_classes = [IsAdminOrReadOnly]  # Lectura para autenticados, escritura solo admin
@@ -8810,7 +8735,8 @@ class AjusteAsignadoViewSet(viewsets.ModelViewSet):
         """
         Filtrar ajustes asignados según el rol del usuario.
         """
-        queryset = AjusteAsignado.objects.all()
+        # Se incluyen el ajuste y la solicitud (con su estudiante) que muestra el serializer
+        queryset = AjusteAsignado.objects.select_related('ajuste_razonable', 'solicitudes__estudiantes')
         user = self.request.user
         
         if user.is_superuser or user.is_staff:
@@ -8846,7 +8772,8 @@ class PerfilUsuarioViewSet(viewsets.ModelViewSet):
         """
         Los usuarios solo pueden ver su propio perfil, excepto administradores.
         """
-        queryset = PerfilUsuario.objects.all()
+        # Se incluyen el usuario, el rol y el área que muestra el serializer
+        queryset = PerfilUsuario.objects.select_related('usuario', 'rol', 'area')
         if self.request.user.is_superuser or self.request.user.is_staff:
             return queryset
         # Usuario normal solo ve su propio perfil